@@ -3,12 +3,18 @@ Zone 2 Indoor Cycling App
 Main application with web UI, BLE connectivity, ERG mode, and workout recording.
 """
 
+# Must run before anything else imports socket/threading/time
+import eventlet
+eventlet.monkey_patch()
+
 import asyncio
 import json
+import logging
 import os
-import time
 import threading
+from collections import deque
 from datetime import datetime
+import orjson
 from flask import Flask, render_template
 from flask_socketio import SocketIO
 
@@ -18,6 +24,9 @@ from src.alert_manager import AlertManager, AlertConfig
 from src.fit_exporter import FitExporter
 from src.workout_manager import WorkoutManager, WorkoutPhase
 
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger('zone2')
+
 # Initialize Flask app - use absolute path to ensure correct templates
 import pathlib
 BASE_DIR = pathlib.Path(__file__).parent.absolute()
@@ -25,17 +34,39 @@ app = Flask(__name__, template_folder=str(BASE_DIR / 'templates'))
 app.config['SECRET_KEY'] = 'zone2cycling'
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 app.jinja_env.auto_reload = True
-socketio = SocketIO(app, async_mode='threading', cors_allowed_origins="*")
+
+
+class OrjsonSerializer:
+    """JSON module shim so Socket.IO packets are encoded with orjson."""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        # Analyzer stats are numpy scalars
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*", json=OrjsonSerializer)
+
+WORKOUTS_DIR = pathlib.Path('workouts')
+WORKOUTS_DIR.mkdir(exist_ok=True)
 
 # Load config
 CONFIG_FILE = 'config.json'
+_config_last_written = None  # Serialized config as it currently is on disk
 
 
 def load_config():
     """Load configuration from file."""
+    global _config_last_written
     if os.path.exists(CONFIG_FILE):
         with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
+            loaded = json.load(f)
+        _config_last_written = json.dumps(loaded, indent=4)
+        return loaded
     return {
         "user": {"ftp": 215, "max_hr": 190, "zone2_hr_low": 124, "zone2_hr_high": 143},
         "workout": {"warmup_minutes": 5, "main_minutes": 50, "cooldown_minutes": 5, "zone2_percent_ftp": 65},
@@ -45,9 +76,15 @@ def load_config():
 
 
 def save_config(config):
-    """Save configuration to file."""
+    """Save configuration to file, skipping the write if nothing changed."""
+    global _config_last_written
+    serialized = json.dumps(config, indent=4)
+    if serialized == _config_last_written:
+        return
+
     with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=4)
+        f.write(serialized)
+    _config_last_written = serialized
 
 
 config = load_config()
@@ -80,9 +117,24 @@ fit_exporter = FitExporter()
 
 # State
 workout_active = False
+workout_started_at = datetime.now()
 ble_loop = None
 ble_thread = None
+ble_loop_ready = threading.Event()
 workout_update_thread = None
+config_payload = None  # Cached 'config' emit; reset whenever its inputs change
+
+# Latest telemetry per stream, coalesced into one 'telemetry' emit
+TELEMETRY_INTERVAL = 0.5  # seconds (2 Hz)
+_latest = {'bike': None, 'hr': None, 'stats': None}
+_bike_payload = {'power': 0, 'cadence': 0, 'speed': 0.0, 'timestamp': 0.0, 'target_power': 0}
+_hr_payload = {'heart_rate': 0, 'timestamp': 0.0}
+_last_bike_key = None  # (power, cadence, speed) last queued for the UI
+_n_clients = 0  # Connected browser clients
+
+# FIT samples buffered by the BLE callbacks, moved into the exporter in batches
+RECORD_FLUSH_INTERVAL = 2.0  # seconds
+_pending_records = deque()
 
 
 def run_async(coro):
@@ -93,21 +145,30 @@ def run_async(coro):
     return None
 
 
+def run_async_nowait(coro):
+    """Schedule an async coroutine in the BLE event loop without waiting for it."""
+    if ble_loop:
+        asyncio.run_coroutine_threadsafe(coro, ble_loop)
+    else:
+        coro.close()
+
+
 def ble_thread_func():
     """Background thread for BLE operations."""
     global ble_loop
     ble_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(ble_loop)
+    ble_loop_ready.set()
     ble_loop.run_forever()
 
 
 def start_ble_thread():
-    """Start the BLE background thread."""
+    """Start the BLE background task."""
     global ble_thread
-    if ble_thread is None or not ble_thread.is_alive():
-        ble_thread = threading.Thread(target=ble_thread_func, daemon=True)
-        ble_thread.start()
-        time.sleep(0.5)  # Give loop time to start
+    if ble_thread is None or ble_thread.dead:
+        ble_loop_ready.clear()
+        ble_thread = socketio.start_background_task(ble_thread_func)
+        ble_loop_ready.wait(timeout=2.0)
 
 
 def workout_update_loop():
@@ -119,7 +180,7 @@ def workout_update_loop():
 
         if new_power is not None:
             # Power target changed, update ERG mode
-            run_async(ble_manager.set_target_power(new_power))
+            run_async_nowait(ble_manager.set_target_power(new_power))
 
         # Send workout status to UI
         socketio.emit('workout_status', {
@@ -132,17 +193,43 @@ def workout_update_loop():
             'total_duration': workout_manager.total_duration_seconds
         })
 
-        time.sleep(1.0)
+        # Wake at the next segment boundary or ramp step, but at least every
+        # second so the UI clock keeps ticking
+        socketio.sleep(max(0.1, min(1.0, workout_manager.seconds_until_next_change())))
 
     # Workout completed naturally
     if not workout_manager.is_running and workout_active:
         handle_workout_complete()
 
 
+def telemetry_flush_loop():
+    """Background loop that emits the latest bike/HR/stats values at a fixed rate."""
+    while True:
+        socketio.sleep(TELEMETRY_INTERVAL)
+        if _n_clients and (_latest['bike'] or _latest['hr'] or _latest['stats']):
+            socketio.emit('telemetry', dict(_latest))
+            _latest['bike'] = _latest['hr'] = _latest['stats'] = None
+
+
+def record_flush_loop():
+    """Background loop that moves buffered samples into the FIT exporter."""
+    while True:
+        socketio.sleep(RECORD_FLUSH_INTERVAL)
+        flush_pending_records()
+
+
+def flush_pending_records():
+    """Add all buffered (timestamp, hr, power, cadence, speed) samples to the exporter."""
+    add_record = fit_exporter.add_record
+    while _pending_records:
+        add_record(*_pending_records.popleft())
+
+
 def handle_workout_complete():
     """Handle workout completion."""
     global workout_active
     workout_active = False
+    set_recording(False)
 
     # Stop ERG mode
     run_async(ble_manager.stop_erg_mode())
@@ -151,12 +238,12 @@ def handle_workout_complete():
     alert_manager.announce("Workout complete! Great job. Saving your ride.")
 
     # Save FIT file
+    flush_pending_records()
     if fit_exporter.record_count > 0:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'workouts/zone2_ride_{timestamp}.fit'
-        os.makedirs('workouts', exist_ok=True)
+        timestamp = workout_started_at.strftime('%Y%m%d_%H%M%S')
+        filename = f'{WORKOUTS_DIR}/zone2_ride_{timestamp}.fit'
         filepath = fit_exporter.export(filename)
-        print(f'Workout saved to: {filepath}')
+        logger.info('Workout saved to: %s', filepath)
         socketio.emit('workout_saved', {'filename': filepath})
 
     socketio.emit('workout_complete', {})
@@ -166,32 +253,47 @@ def handle_workout_complete():
 # Workout manager callbacks
 def on_power_change(power: int):
     """Called when workout manager wants to change ERG power."""
-    print(f"ERG power target: {power}W")
+    logger.info('ERG power target: %sW', power)
     socketio.emit('erg_power', {'target': power})
 
 
+# Spoken phase announcements, formatted with the segment name, Zone 2 power and HR target
+ZONE2_PHASE_MESSAGES = {
+    WorkoutPhase.WARMUP: "Starting warmup. Ramping to {zone2_power} watts.",
+    WorkoutPhase.MAIN: "Warmup complete. HR-targeted Zone 2. Power will auto-adjust to keep HR at {hr_target} BPM.",
+    WorkoutPhase.COOLDOWN: "Starting cooldown. Ramping down.",
+    WorkoutPhase.COMPLETED: "Workout complete!"
+}
+
+STRUCTURED_PHASE_MESSAGES = {
+    WorkoutPhase.WARMUP: "Starting warmup.",
+    WorkoutPhase.MAIN: "Main set starting. Hold your effort!",
+    WorkoutPhase.INTERVAL: "{name} - push hard!",
+    WorkoutPhase.RECOVERY: "{name} - easy spinning.",
+    WorkoutPhase.COOLDOWN: "Starting cooldown. Ramping down.",
+    WorkoutPhase.COMPLETED: "Workout complete!"
+}
+
+
 def on_phase_change(phase: WorkoutPhase, name: str):
     """Called when workout phase changes."""
-    print(f"Workout phase: {name}")
+    logger.info('Workout phase: %s', name)
 
-    # Build appropriate message based on workout type and phase
+    # Pick the message set based on workout type
     if workout_manager.current_workout_type == "zone2":
-        messages = {
-            WorkoutPhase.WARMUP: f"Starting warmup. Ramping to {workout_manager.config.zone2_power} watts.",
-            WorkoutPhase.MAIN: f"Warmup complete. HR-targeted Zone 2. Power will auto-adjust to keep HR at {workout_manager.hr_target} BPM.",
-            WorkoutPhase.COOLDOWN: "Starting cooldown. Ramping down.",
-            WorkoutPhase.COMPLETED: "Workout complete!"
-        }
+        template = ZONE2_PHASE_MESSAGES.get(phase)
     else:
-        messages = {
-            WorkoutPhase.WARMUP: f"Starting warmup.",
-            WorkoutPhase.MAIN: f"Main set starting. Hold your effort!",
-            WorkoutPhase.INTERVAL: f"{name} - push hard!",
-            WorkoutPhase.RECOVERY: f"{name} - easy spinning.",
-            WorkoutPhase.COOLDOWN: "Starting cooldown. Ramping down.",
-            WorkoutPhase.COMPLETED: "Workout complete!"
-        }
-    alert_manager.announce(messages.get(phase, name))
+        template = STRUCTURED_PHASE_MESSAGES.get(phase)
+
+    if template is None:
+        message = name
+    else:
+        message = template.format(
+            name=name,
+            zone2_power=workout_manager.config.zone2_power,
+            hr_target=workout_manager.hr_target
+        )
+    alert_manager.announce(message)
     socketio.emit('phase_change', {'phase': phase.value, 'name': name})
 
 
@@ -199,115 +301,146 @@ workout_manager.on_power_change = on_power_change
 workout_manager.on_phase_change = on_phase_change
 
 
-# BLE data callbacks
-def on_bike_data(data: BikeData):
-    """Called when new bike data is received."""
-    socketio.emit('bike_data', {
-        'power': data.power,
-        'cadence': data.cadence,
-        'speed': round(data.speed, 1),
-        'timestamp': data.timestamp,
-        'target_power': workout_manager.target_power if workout_active else 0
-    })
+# BLE data callbacks - the live-view variants are installed while idle and
+# swapped for the recording variants for the duration of a workout
+def reset_telemetry_dedup():
+    """Make the next bike sample reach the UI even if unchanged."""
+    global _last_bike_key
+    _last_bike_key = None
+
+
+def _live_bike(data: BikeData):
+    """Called when new bike data is received outside a workout."""
+    global _last_bike_key
+    if not _n_clients:
+        return
+    speed = round(data.speed, 1)
+    key = (data.power, data.cadence, speed)
+    if key == _last_bike_key:
+        return
+    _last_bike_key = key
 
-    if workout_active:
-        # Get current HR for the record
-        hr_data = ble_manager.get_last_hr_data()
-        fit_exporter.add_record(
-            timestamp=data.timestamp,
-            heart_rate=hr_data.heart_rate,
-            power=data.power,
-            cadence=data.cadence,
-            speed=data.speed / 3.6  # Convert km/h to m/s
+    # Reuse one payload dict; it is serialized on the next telemetry flush
+    _bike_payload['power'] = data.power
+    _bike_payload['cadence'] = data.cadence
+    _bike_payload['speed'] = speed
+    _bike_payload['timestamp'] = data.timestamp
+    _bike_payload['target_power'] = 0
+    _latest['bike'] = _bike_payload
+
+
+def _record_bike(data: BikeData):
+    """Called when new bike data is received during a workout."""
+    global _last_bike_key
+
+    # Get current HR for the record (speed converted from km/h to m/s)
+    hr_data = ble_manager.get_last_hr_data()
+    _pending_records.append((data.timestamp, hr_data.heart_rate, data.power, data.cadence, data.speed / 3.6))
+
+    speed = round(data.speed, 1)
+    key = (data.power, data.cadence, speed)
+    if key == _last_bike_key:
+        return
+    _last_bike_key = key
+
+    _bike_payload['power'] = data.power
+    _bike_payload['cadence'] = data.cadence
+    _bike_payload['speed'] = speed
+    _bike_payload['timestamp'] = data.timestamp
+    _bike_payload['target_power'] = workout_manager.target_power
+    _latest['bike'] = _bike_payload
+
+
+def _live_hr(data: HRData):
+    """Called when new HR data is received outside a workout."""
+    # Queued on every sample, even if unchanged: the UI's HR graph plots one
+    # point per message
+    if not _n_clients:
+        return
+
+    _hr_payload['heart_rate'] = data.heart_rate
+    _hr_payload['timestamp'] = data.timestamp
+    _latest['hr'] = _hr_payload
+
+
+def _record_hr(data: HRData):
+    """Called when new HR data is received during a workout."""
+    _hr_payload['heart_rate'] = data.heart_rate
+    _hr_payload['timestamp'] = data.timestamp
+    _latest['hr'] = _hr_payload
+
+    bike_data = ble_manager.get_last_bike_data()
+
+    # Feed HR to workout manager for HR-targeted power control
+    workout_manager.add_hr_sample(data.heart_rate)
+
+    # Check if HR-targeted mode wants to adjust power
+    if workout_manager.is_hr_target_mode:
+        new_power = workout_manager.get_hr_adjusted_power()
+        if new_power is not None:
+            # Power target changed based on HR, update ERG (this runs on
+            # the BLE loop itself, so it must not wait on it)
+            run_async_nowait(ble_manager.set_target_power(new_power))
+            socketio.emit('erg_power', {'target': new_power})
+            socketio.emit('hr_adjustment', {
+                'new_power': new_power,
+                'hr_target': workout_manager.hr_target,
+                'current_hr': data.heart_rate
+            })
+
+    # Update analyzer (now tracking power zones)
+    # Only trigger HR zone alerts during main phase if NOT in HR-target mode
+    # (HR-target mode auto-adjusts, so no need to nag the user)
+    current_phase = workout_manager.current_phase.value
+    if not workout_manager.is_hr_target_mode:
+        alerts = zone_analyzer.update(
+            hr=data.heart_rate,
+            power=bike_data.power,
+            cadence=bike_data.cadence,
+            phase=current_phase
         )
 
-        # Check power deviation from target
-        target = workout_manager.target_power
-        if target > 0 and abs(data.power - target) > target * 0.15:
-            # Power is >15% off target (but don't alert, ERG should handle it)
-            pass
+        # Send alerts
+        for alert in alerts:
+            alert_manager.alert(alert.type, alert.message, alert.severity)
+            socketio.emit('alert', {
+                'type': alert.type,
+                'message': alert.message,
+                'severity': alert.severity
+            })
+    else:
+        # Still update stats even in HR-target mode
+        zone_analyzer.update(
+            hr=data.heart_rate,
+            power=bike_data.power,
+            cadence=bike_data.cadence,
+            phase=current_phase
+        )
 
+    # Send updated stats
+    stats = zone_analyzer.get_stats()
+    # Sent unrounded; the UI formats values for display
+    _latest['stats'] = {
+        'avg_hr': stats.avg_hr,
+        'avg_power': stats.avg_power,
+        'avg_cadence': stats.avg_cadence,
+        'time_in_zone': stats.time_in_zone,
+        'efficiency_factor': stats.efficiency_factor,
+        'cardiac_drift_percent': stats.cardiac_drift_percent
+    }
 
-def on_hr_data(data: HRData):
-    """Called when new HR data is received."""
-    socketio.emit('hr_data', {
-        'heart_rate': data.heart_rate,
-        'timestamp': data.timestamp
-    })
+    # Add HR-only record if no bike data
+    if bike_data.power == 0:
+        _pending_records.append((data.timestamp, data.heart_rate, 0, 0, 0))
 
-    if workout_active:
-        bike_data = ble_manager.get_last_bike_data()
-
-        # Feed HR to workout manager for HR-targeted power control
-        workout_manager.add_hr_sample(data.heart_rate)
-
-        # Check if HR-targeted mode wants to adjust power
-        if workout_manager.is_hr_target_mode:
-            new_power = workout_manager.get_hr_adjusted_power()
-            if new_power is not None:
-                # Power target changed based on HR, update ERG
-                run_async(ble_manager.set_target_power(new_power))
-                socketio.emit('erg_power', {'target': new_power})
-                socketio.emit('hr_adjustment', {
-                    'new_power': new_power,
-                    'hr_target': workout_manager.hr_target,
-                    'current_hr': data.heart_rate
-                })
-
-        # Update analyzer (now tracking power zones)
-        # Only trigger HR zone alerts during main phase if NOT in HR-target mode
-        # (HR-target mode auto-adjusts, so no need to nag the user)
-        current_phase = workout_manager.current_phase.value
-        if not workout_manager.is_hr_target_mode:
-            alerts = zone_analyzer.update(
-                hr=data.heart_rate,
-                power=bike_data.power,
-                cadence=bike_data.cadence,
-                phase=current_phase
-            )
-
-            # Send alerts
-            for alert in alerts:
-                alert_manager.alert(alert.type, alert.message, alert.severity)
-                socketio.emit('alert', {
-                    'type': alert.type,
-                    'message': alert.message,
-                    'severity': alert.severity
-                })
-        else:
-            # Still update stats even in HR-target mode
-            zone_analyzer.update(
-                hr=data.heart_rate,
-                power=bike_data.power,
-                cadence=bike_data.cadence,
-                phase=current_phase
-            )
-
-        # Send updated stats
-        stats = zone_analyzer.get_stats()
-        socketio.emit('stats', {
-            'avg_hr': round(stats.avg_hr, 1),
-            'avg_power': round(stats.avg_power, 1),
-            'avg_cadence': round(stats.avg_cadence, 1),
-            'time_in_zone': round(stats.time_in_zone, 0),
-            'efficiency_factor': round(stats.efficiency_factor, 2),
-            'cardiac_drift_percent': round(stats.cardiac_drift_percent, 1)
-        })
 
-        # Add HR-only record if no bike data
-        if bike_data.power == 0:
-            fit_exporter.add_record(
-                timestamp=data.timestamp,
-                heart_rate=data.heart_rate,
-                power=0,
-                cadence=0,
-                speed=0
-            )
+def set_recording(recording: bool):
+    """Swap the BLE callbacks between the live-view and recording variants."""
+    ble_manager.on_bike_data = _record_bike if recording else _live_bike
+    ble_manager.on_hr_data = _record_hr if recording else _live_hr
 
 
-# Set callbacks
-ble_manager.on_bike_data = on_bike_data
-ble_manager.on_hr_data = on_hr_data
+set_recording(False)
 
 
 # Routes
@@ -320,19 +453,35 @@ def index():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection."""
-    print('Client connected')
+    global _n_clients
+    _n_clients += 1
+    logger.info('Client connected')
+    reset_telemetry_dedup()
     emit_device_status()
 
 
+@socketio.on('disconnect')
+def handle_disconnect(reason=None):
+    """Handle client disconnection."""
+    global _n_clients
+    _n_clients = max(0, _n_clients - 1)
+    logger.info('Client disconnected')
+
+
 @socketio.on('get_config')
 def handle_get_config():
     """Send current configuration to client."""
+    global config_payload
+    if config_payload is not None:
+        socketio.emit('config', config_payload)
+        return
+
     summary = workout_manager.get_workout_summary()
     try:
         workout_types = workout_manager.get_workout_types()
-        print(f"Sending config with {len(workout_types)} workout types: {[w['id'] for w in workout_types]}")
+        logger.info('Sending config with %d workout types: %s', len(workout_types), [w['id'] for w in workout_types])
     except Exception as e:
-        print(f"ERROR getting workout types: {e}")
+        logger.error('ERROR getting workout types: %s', e)
         # Fallback to hardcoded list
         workout_types = [
             {"id": "zone2", "name": "Zone 2 (HR Targeted)", "description": "HR-targeted endurance", "frequency_hint": "Power auto-adjusts to maintain target HR", "duration_minutes": 60, "intensity": "Low"},
@@ -340,7 +489,7 @@ def handle_get_config():
             {"id": "sweet_spot", "name": "Sweet Spot", "description": "2x20min @ 88-93% FTP", "frequency_hint": "1x per week", "duration_minutes": 55, "intensity": "Medium-High"},
             {"id": "tempo", "name": "Tempo/Threshold", "description": "2x15min @ 95-100% FTP", "frequency_hint": "1x per week", "duration_minutes": 45, "intensity": "High"}
         ]
-    socketio.emit('config', {
+    config_payload = {
         'ftp': config['user']['ftp'],
         'zone2_power': summary['zone2_power'],
         'zone2_range': summary['zone2_range'],
@@ -355,7 +504,14 @@ def handle_get_config():
         'hr_zone2_low': summary['hr_zone2_low'],
         'hr_zone2_high': summary['hr_zone2_high'],
         'hr_target_mode': summary['hr_target_mode']
-    })
+    }
+    socketio.emit('config', config_payload)
+
+
+def invalidate_config_payload():
+    """Force the next get_config to rebuild the payload."""
+    global config_payload
+    config_payload = None
 
 
 @socketio.on('set_workout_type')
@@ -363,7 +519,8 @@ def handle_set_workout_type(data):
     """Change the workout type."""
     workout_type = data.get('workout_type', 'zone2')
     workout_manager.set_workout_type(workout_type)
-    print(f'Workout type changed to: {workout_type}')
+    invalidate_config_payload()
+    logger.info('Workout type changed to: %s', workout_type)
 
     # Send updated config
     handle_get_config()
@@ -372,7 +529,7 @@ def handle_set_workout_type(data):
 @socketio.on('scan_devices')
 def handle_scan():
     """Scan for BLE devices."""
-    print('Scanning for devices...')
+    logger.info('Scanning for devices...')
     start_ble_thread()
 
     async def do_scan():
@@ -412,14 +569,10 @@ def handle_connect_trainer(data):
         socketio.emit('alert', {'type': 'error', 'message': 'No device address provided', 'severity': 'warning'})
         return
 
-    print(f'Connecting to trainer: {name} ({address})')
+    logger.info('Connecting to trainer: %s (%s)', name, address)
     start_ble_thread()
 
-    async def do_connect():
-        success = await ble_manager.connect_to_device(address, name)
-        return success
-
-    success = run_async(do_connect())
+    success = run_async(ble_manager.connect_to_device(address, name))
 
     if success:
         # Update config with new trainer name
@@ -435,12 +588,9 @@ def handle_connect_trainer(data):
 @socketio.on('disconnect_trainer')
 def handle_disconnect_trainer():
     """Disconnect from current trainer."""
-    print('Disconnecting trainer...')
-
-    async def do_disconnect():
-        await ble_manager.disconnect_trainer()
+    logger.info('Disconnecting trainer...')
 
-    run_async(do_disconnect())
+    run_async(ble_manager.disconnect_trainer())
     emit_device_status()
 
 
@@ -461,17 +611,24 @@ def handle_set_device_filter(data):
 @socketio.on('start_workout')
 def handle_start_workout():
     """Start a new workout with ERG mode."""
-    global workout_active, workout_update_thread
+    global workout_active, workout_started_at, workout_update_thread
 
-    print('Starting workout...')
+    logger.info('Starting workout...')
     workout_active = True
+    workout_started_at = datetime.now()
 
     # Reset components
     zone_analyzer.reset()
     fit_exporter.clear()
+    _pending_records.clear()
+    reset_telemetry_dedup()
+    set_recording(True)
 
     # Start alert manager
-    alert_manager.start()
+    if ble_loop is None:
+        logger.warning('BLE event loop not running; audio alerts disabled for this workout')
+    else:
+        alert_manager.start(ble_loop)
     alert_manager.play_sound('start')
 
     # Start workout manager
@@ -481,9 +638,8 @@ def handle_start_workout():
     initial_power = workout_manager.target_power
     run_async(ble_manager.set_target_power(initial_power))
 
-    # Start workout update thread
-    workout_update_thread = threading.Thread(target=workout_update_loop, daemon=True)
-    workout_update_thread.start()
+    # Start workout update task
+    workout_update_thread = socketio.start_background_task(workout_update_loop)
 
 
 @socketio.on('stop_workout')
@@ -491,8 +647,9 @@ def handle_stop_workout():
     """Stop workout and save FIT file."""
     global workout_active
 
-    print('Stopping workout...')
+    logger.info('Stopping workout...')
     workout_active = False
+    set_recording(False)
     workout_manager.stop()
 
     # Stop ERG mode
@@ -502,12 +659,12 @@ def handle_stop_workout():
     alert_manager.announce("Workout stopped. Saving file.")
 
     # Save FIT file
+    flush_pending_records()
     if fit_exporter.record_count > 0:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'workouts/zone2_ride_{timestamp}.fit'
-        os.makedirs('workouts', exist_ok=True)
+        timestamp = workout_started_at.strftime('%Y%m%d_%H%M%S')
+        filename = f'{WORKOUTS_DIR}/zone2_ride_{timestamp}.fit'
         filepath = fit_exporter.export(filename)
-        print(f'Workout saved to: {filepath}')
+        logger.info('Workout saved to: %s', filepath)
         socketio.emit('workout_saved', {'filename': filepath})
         alert_manager.announce(f"Workout saved.")
     else:
@@ -528,8 +685,9 @@ def handle_update_ftp(data):
     save_config(config)
 
     workout_manager.set_ftp(ftp)
+    invalidate_config_payload()
     
-    print(f'FTP updated: {ftp}W, Zone 2 Power: {workout_manager.config.zone2_low}-{workout_manager.config.zone2_high}W')
+    logger.info('FTP updated: %sW, Zone 2 Power: %s-%sW', ftp, workout_manager.config.zone2_low, workout_manager.config.zone2_high)
 
     # Send updated config
     handle_get_config()
@@ -553,8 +711,9 @@ def handle_update_hr_zones(data):
             hr_low=data['zone2_hr_low'],
             hr_high=data['zone2_hr_high']
         )
+        invalidate_config_payload()
 
-        print(f"HR zones updated: {data['zone2_hr_low']}-{data['zone2_hr_high']} BPM (target: {workout_manager.hr_target})")
+        logger.info('HR zones updated: %s-%s BPM (target: %s)', data['zone2_hr_low'], data['zone2_hr_high'], workout_manager.hr_target)
         socketio.emit('hr_zones_updated', {
             'zone2_hr_low': data['zone2_hr_low'],
             'zone2_hr_high': data['zone2_hr_high'],
@@ -568,22 +727,23 @@ def handle_update_settings(data):
     if 'audio_enabled' in data:
         config['alerts']['audio_enabled'] = data['audio_enabled']
         alert_manager.config.audio_enabled = data['audio_enabled']
+        invalidate_config_payload()
         save_config(config)
-        print(f'Audio alerts: {data["audio_enabled"]}')
+        logger.info('Audio alerts: %s', data['audio_enabled'])
 
 
 @socketio.on('set_erg_power')
 def handle_set_erg_power(data):
     """Manually set ERG power (for testing/override)."""
     power = data.get('power', 100)
-    run_async(ble_manager.set_target_power(power))
+    run_async_nowait(ble_manager.set_target_power(power))
     socketio.emit('erg_power', {'target': power})
 
 
 @socketio.on('stop_erg')
 def handle_stop_erg():
     """Stop ERG mode (free ride)."""
-    run_async(ble_manager.stop_erg_mode())
+    run_async_nowait(ble_manager.stop_erg_mode())
     socketio.emit('erg_power', {'target': 0})
 
 
@@ -619,8 +779,10 @@ if __name__ == '__main__':
     print("Open http://localhost:8080 in your browser")
     print("="*50 + "\n")
 
-    # Start BLE thread
+    # Start BLE thread, telemetry emitter and FIT record batching
     start_ble_thread()
+    socketio.start_background_task(telemetry_flush_loop)
+    socketio.start_background_task(record_flush_loop)
 
     # Run Flask app
     socketio.run(app, host='0.0.0.0', port=8080, debug=False, allow_unsafe_werkzeug=True)
@@ -2,13 +2,21 @@
 Alert Manager - handles audio and visual alerts.
 """
 
-import threading
-import queue
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
+import os
 import subprocess
 import sys
 
+try:
+    import pty
+    import termios
+except ImportError:  # Not available on Windows; only the macOS 'say' path uses them
+    pty = termios = None
+
 
 @dataclass
 class AlertConfig:
@@ -21,69 +29,143 @@ class AlertConfig:
 class AlertManager:
     """Manages audio and visual alerts for the workout."""
 
+    # Short spoken phrases per alert type and severity
+    _SPEECH_MESSAGES = {
+        'hr_high': "Heart rate too high. Ease up.",
+        'hr_low': "Heart rate too low. Push harder.",
+        'cardiac_drift': "Cardiac drift detected. You may be fatiguing.",
+        'decoupling': "Power and heart rate decoupling. Consider wrapping up."
+    }
+    _SPEECH_PREFIX = {'warning': "Warning: "}
+
     def __init__(self, config: Optional[AlertConfig] = None):
         self.config = config or AlertConfig()
-        self._speech_queue: queue.Queue = queue.Queue()
-        self._speech_thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        # Single worker so pyttsx3 is always driven from the thread that created it
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts')
         self._running = False
         self._tts_engine = None
+        self._tts_initialized = False
+        self._say_proc: Optional[subprocess.Popen] = None
+        self._say_fd: Optional[int] = None
         self._use_system_say = sys.platform == 'darwin'  # macOS has 'say' command
 
-    def start(self):
-        """Start the alert manager."""
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start the alert manager, speaking from a task on the given event loop."""
+        self._loop = loop
+        self._queue = asyncio.Queue()
         self._running = True
-        self._speech_thread = threading.Thread(target=self._speech_worker, daemon=True)
-        self._speech_thread.start()
+        asyncio.run_coroutine_threadsafe(self._run(self._queue), loop)
 
     def stop(self):
-        """Stop the alert manager."""
-        self._running = False
-        if self._speech_thread:
-            self._speech_queue.put(None)  # Signal to stop
-            self._speech_thread.join(timeout=2.0)
-
-    def _speech_worker(self):
-        """Background thread for text-to-speech."""
-        # Initialize TTS engine in this thread
-        if not self._use_system_say:
-            try:
-                import pyttsx3
-                self._tts_engine = pyttsx3.init()
-                self._tts_engine.setProperty('rate', 150)
-            except Exception as e:
-                print(f"Could not initialize TTS engine: {e}")
-                self._tts_engine = None
-
-        while self._running:
-            try:
-                message = self._speech_queue.get(timeout=1.0)
-                if message is None:
-                    break
-
-                if self.config.audio_enabled:
-                    self._speak(message)
+        """Stop the alert manager once queued messages have been spoken.
 
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Speech error: {e}")
+        The speech task shuts down the 'say' process after the last message.
+        """
+        self._running = False
+        if self._loop and self._queue:
+            self._enqueue(None)  # Signal to stop
+        else:
+            self._close_say_process()
+
+    def _enqueue(self, message: Optional[str]):
+        """Hand a message to the speech task from any thread."""
+        if self._loop and self._queue:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+
+    async def _run(self, speech_queue: asyncio.Queue):
+        """Speech task - blocking TTS calls run on the executor thread."""
+        loop = asyncio.get_running_loop()
+
+        # Initialize TTS engine on the executor thread
+        if not self._use_system_say and not self._tts_initialized:
+            await loop.run_in_executor(self._executor, self._init_tts_engine)
+
+        while True:
+            message = await speech_queue.get()
+            if message is None:
+                await loop.run_in_executor(self._executor, self._close_say_process)
+                return
+
+            if self.config.audio_enabled:
+                await loop.run_in_executor(self._executor, self._speak, message)
+
+    def _init_tts_engine(self):
+        """Create the pyttsx3 engine (non-macOS only)."""
+        self._tts_initialized = True
+        try:
+            import pyttsx3
+            self._tts_engine = pyttsx3.init()
+            self._tts_engine.setProperty('rate', 150)
+        except Exception as e:
+            print(f"Could not initialize TTS engine: {e}")
+            self._tts_engine = None
 
     def _speak(self, message: str):
         """Speak a message using TTS."""
         try:
             if self._use_system_say:
                 # Use macOS 'say' command - more reliable
-                subprocess.run(
-                    ['say', '-v', 'Samantha', message],
-                    capture_output=True,
-                    timeout=10
-                )
+                try:
+                    self._say_line(message)
+                except OSError:
+                    subprocess.run(
+                        ['say', '-v', 'Samantha', message],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        timeout=10
+                    )
             elif self._tts_engine:
                 self._tts_engine.say(message)
                 self._tts_engine.runAndWait()
         except Exception as e:
             print(f"TTS error: {e}")
 
+    def _say_line(self, message: str):
+        """Send a line to the persistent 'say' process, starting it if needed."""
+        if self._say_proc is None or self._say_proc.poll() is not None:
+            self._start_say_process()
+        os.write(self._say_fd, (message + '\n').encode())
+
+    def _start_say_process(self):
+        """Start one long-lived 'say' process instead of forking per message."""
+        if self._say_fd is not None:
+            os.close(self._say_fd)
+            self._say_fd = None
+
+        # 'say' only speaks line by line when stdin is a TTY, so feed it through a pty
+        master, slave = pty.openpty()
+        try:
+            attrs = termios.tcgetattr(slave)
+            attrs[3] &= ~termios.ECHO  # Nobody reads the echo back
+            termios.tcsetattr(slave, termios.TCSANOW, attrs)
+            self._say_proc = subprocess.Popen(
+                ['say', '-v', 'Samantha'],
+                stdin=slave,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            os.close(master)
+            raise
+        finally:
+            os.close(slave)
+        self._say_fd = master
+
+    def _close_say_process(self):
+        """Close the pty and reap the 'say' process, letting it finish the current line."""
+        if self._say_fd is not None:
+            os.close(self._say_fd)  # EOF on its stdin
+            self._say_fd = None
+        if self._say_proc is not None:
+            try:
+                self._say_proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._say_proc.terminate()
+                self._say_proc.wait()
+            self._say_proc = None
+
     def alert(self, alert_type: str, message: str, severity: str = 'warning'):
         """
         Trigger an alert.
@@ -97,25 +179,19 @@ class AlertManager:
         if self.config.audio_enabled:
             # Simplify message for speech
             speech_message = self._simplify_for_speech(alert_type, severity)
-            self._speech_queue.put(speech_message)
+            self._enqueue(speech_message)
 
-    def _simplify_for_speech(self, alert_type: str, severity: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _simplify_for_speech(alert_type: str, severity: str) -> str:
         """Create a short, clear spoken message."""
-        prefix = "Warning: " if severity == 'warning' else "Alert: "
-
-        messages = {
-            'hr_high': "Heart rate too high. Ease up.",
-            'hr_low': "Heart rate too low. Push harder.",
-            'cardiac_drift': "Cardiac drift detected. You may be fatiguing.",
-            'decoupling': "Power and heart rate decoupling. Consider wrapping up."
-        }
-
-        return prefix + messages.get(alert_type, "Check your metrics.")
+        prefix = AlertManager._SPEECH_PREFIX.get(severity, "Alert: ")
+        return prefix + AlertManager._SPEECH_MESSAGES.get(alert_type, "Check your metrics.")
 
     def announce(self, message: str):
         """Announce a general message."""
         if self.config.audio_enabled:
-            self._speech_queue.put(message)
+            self._enqueue(message)
 
     def play_sound(self, sound_type: str = 'alert'):
         """Play a notification sound."""
@@ -126,22 +202,22 @@ class AlertManager:
             if self._use_system_say:
                 # Use macOS system sounds
                 if sound_type == 'alert':
-                    subprocess.run(
+                    subprocess.Popen(
                         ['afplay', '/System/Library/Sounds/Ping.aiff'],
-                        capture_output=True,
-                        timeout=5
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
                     )
                 elif sound_type == 'start':
-                    subprocess.run(
+                    subprocess.Popen(
                         ['afplay', '/System/Library/Sounds/Glass.aiff'],
-                        capture_output=True,
-                        timeout=5
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
                     )
                 elif sound_type == 'stop':
-                    subprocess.run(
+                    subprocess.Popen(
                         ['afplay', '/System/Library/Sounds/Hero.aiff'],
-                        capture_output=True,
-                        timeout=5
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
                     )
         except Exception as e:
             print(f"Sound error: {e}")
@@ -4,10 +4,15 @@ Handles Wahoo KICKR (FTMS protocol) and Myzone HR monitor.
 """
 
 import asyncio
+import logging
 from bleak import BleakScanner, BleakClient
 from dataclasses import dataclass
 from typing import Callable, Optional
+import re
 import struct
+import time
+
+logger = logging.getLogger(__name__)
 
 # Standard BLE UUIDs
 HEART_RATE_SERVICE = "0000180d-0000-1000-8000-00805f9b34fb"
@@ -26,6 +31,9 @@ FTMS_SET_TARGET_POWER = 0x05
 FTMS_START_RESUME = 0x07
 FTMS_STOP_PAUSE = 0x08
 
+# Minimum spacing between Set Target Power writes; newer targets replace pending ones
+ERG_WRITE_INTERVAL = 0.25  # seconds
+
 # Cycling Power Service (alternative for some trainers)
 CYCLING_POWER_SERVICE = "00001818-0000-1000-8000-00805f9b34fb"
 CYCLING_POWER_MEASUREMENT = "00002a63-0000-1000-8000-00805f9b34fb"
@@ -34,8 +42,35 @@ CYCLING_POWER_MEASUREMENT = "00002a63-0000-1000-8000-00805f9b34fb"
 CSC_SERVICE = "00001816-0000-1000-8000-00805f9b34fb"
 CSC_MEASUREMENT = "00002a5b-0000-1000-8000-00805f9b34fb"
 
-
-@dataclass
+_time = time.time
+
+# Name fragments that mark a device as a generic trainer or an HR monitor
+_GENERIC_TRAINER_TAGS = ('BIKE', 'TRAINER', 'POWER')
+_HR_TAGS = ('HR', 'HEART', 'MYZONE', 'POLAR', 'GARMIN', 'WAHOO')
+_GENERIC_TRAINER_RE = re.compile('|'.join(_GENERIC_TRAINER_TAGS))
+_HR_RE = re.compile('|'.join(_HR_TAGS))
+
+# Optional FTMS Indoor Bike Data fields following Instantaneous Speed, in wire
+# order: (flag bit, size in bytes, field to read or None to skip)
+_FTMS_FIELDS = (
+    (0x02, 2, None),       # Average Speed
+    (0x04, 2, 'cadence'),  # Instantaneous Cadence (0.5 RPM resolution)
+    (0x08, 2, None),       # Average Cadence
+    (0x10, 3, None),       # Total Distance
+    (0x20, 2, None),       # Resistance Level
+    (0x40, 2, 'power'),    # Instantaneous Power
+)
+
+# Precompiled little-endian layouts for notification parsing and control commands
+_U16 = struct.Struct('<H')
+_S16 = struct.Struct('<h')
+_FTMS_FAST = struct.Struct('<HHh')  # speed, cadence, power: the usual KICKR layout (flags 0x44)
+_CPS_HDR = struct.Struct('<Hh')  # Cycling Power flags + instantaneous power
+_CTRL_B = struct.Struct('<B')
+_CTRL_BH = struct.Struct('<Bh')
+
+
+@dataclass(slots=True)
 class BikeData:
     """Data from the smart trainer."""
     power: int = 0  # Watts
@@ -44,13 +79,98 @@ class BikeData:
     timestamp: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class HRData:
     """Data from heart rate monitor."""
     heart_rate: int = 0  # BPM
     timestamp: float = 0.0
 
 
+_FTMS_FLAG_MASK = sum(mask for mask, _, _ in _FTMS_FIELDS)  # Flag bits the parser looks at
+
+# Record layouts by relevant flag bits: (Struct from speed through the last
+# field we read, cadence index, power index). A trainer sends the same flags
+# for a whole session, so this normally holds a single entry.
+_FTMS_LAYOUTS = {}
+
+
+def _ftms_layout(flags: int) -> tuple:
+    """Build and cache the single-unpack layout for an FTMS flags value."""
+    fmt = '<H'  # Instantaneous Speed
+    index = 1
+    cadence_index = power_index = None
+    for mask, size, field in _FTMS_FIELDS:
+        if flags & mask:
+            if field == 'cadence':
+                fmt += 'H'
+                cadence_index = index
+                index += 1
+            elif field == 'power':
+                fmt += 'h'
+                power_index = index
+                index += 1
+            else:
+                fmt += 'x' * size
+    layout = (struct.Struct(fmt.rstrip('x')), cadence_index, power_index)
+    _FTMS_LAYOUTS[flags] = layout
+    return layout
+
+
+def _parse_indoor_bike_data(data) -> tuple:
+    """Decode an FTMS Indoor Bike Data notification into (power, cadence, speed)."""
+    u16_unpack_from = _U16.unpack_from
+    n = len(data)
+
+    # FTMS Indoor Bike Data format
+    # Flags (2 bytes) determine which fields are present
+    flags = u16_unpack_from(data, 0)[0] & _FTMS_FLAG_MASK
+
+    if flags == 0x44 and n >= 8:
+        speed_raw, cadence_raw, power = _FTMS_FAST.unpack_from(data, 2)
+        return max(0, power), cadence_raw // 2, speed_raw / 100.0
+
+    layout = _FTMS_LAYOUTS.get(flags) or _ftms_layout(flags)
+    record, cadence_index, power_index = layout
+    if n >= 2 + record.size:
+        values = record.unpack_from(data, 2)
+        cadence = values[cadence_index] // 2 if cadence_index is not None else 0
+        power = values[power_index] if power_index is not None else 0
+        return max(0, power), cadence, values[0] / 100.0
+
+    # Truncated notification: read whatever fields fit, one at a time
+    offset = 2
+
+    speed = 0.0
+    cadence = 0
+    power = 0
+
+    # Bit 0: More Data (0 = all data present)
+    # Bit 1: Average Speed present
+    # Bit 2: Instantaneous Cadence present
+    # Bit 3: Average Cadence present
+    # Bit 4: Total Distance present
+    # Bit 5: Resistance Level present
+    # Bit 6: Instantaneous Power present
+    # etc.
+
+    # Instantaneous Speed (always present when bit 0 is 0)
+    if n > offset + 1:
+        speed_raw = u16_unpack_from(data, offset)[0]
+        speed = speed_raw / 100.0  # Convert to km/h
+        offset += 2
+
+    for mask, size, field in _FTMS_FIELDS:
+        if flags & mask:
+            if field is not None and n > offset + 1:
+                if field == 'cadence':
+                    cadence = u16_unpack_from(data, offset)[0] // 2
+                else:
+                    power = _S16.unpack_from(data, offset)[0]
+            offset += size
+
+    return max(0, power), cadence, speed
+
+
 class BLEManager:
     """Manages BLE connections to cycling devices."""
 
@@ -65,6 +185,7 @@ class BLEManager:
         "QUARQ": {"has_erg": False, "protocol": "power"},   # Power meter only
         "ASSIOMA": {"has_erg": False, "protocol": "power"}, # Power meter only
     }
+    _TRAINER_RE = re.compile('|'.join(map(re.escape, KNOWN_TRAINERS)))
 
     def __init__(self, trainer_name: str = "KICKR", hr_name: str = "MYZONE"):
         self.trainer_name = trainer_name.upper()
@@ -77,6 +198,8 @@ class BLEManager:
         self.hr_address: Optional[str] = None
         self.connected_trainer_name: Optional[str] = None
 
+        # Callbacks receive the manager's live BikeData/HRData, which is
+        # updated in place on every notification; copy it to keep a sample
         self.on_bike_data: Optional[Callable[[BikeData], None]] = None
         self.on_hr_data: Optional[Callable[[HRData], None]] = None
 
@@ -94,25 +217,42 @@ class BLEManager:
         self._current_target_power = 0
         self._has_control = False
         self._trainer_has_erg = True  # Assume ERG capable until proven otherwise
+        self._erg_cmd_buf = bytearray(_CTRL_BH.size)  # Reused Set Target Power command
+        self._pending_target: Optional[int] = None
+        self._erg_writer: Optional[asyncio.Task] = None
 
         # Discovered devices cache
         self._discovered_trainers = []
+        self._trainer_type_cache = {}  # upper-cased device name -> KNOWN_TRAINERS key or None
+
+    def _classify_trainer(self, name_upper: str) -> Optional[str]:
+        """Return the KNOWN_TRAINERS type found in a device name, if any."""
+        try:
+            return self._trainer_type_cache[name_upper]
+        except KeyError:
+            match = self._TRAINER_RE.search(name_upper)
+            trainer_type = match.group(0) if match else None
+            self._trainer_type_cache[name_upper] = trainer_type
+            return trainer_type
 
     def set_trainer_name(self, name: str):
         """Change the trainer name to search for."""
         self.trainer_name = name.upper()
-        print(f"Trainer filter set to: {self.trainer_name}")
+        logger.info('Trainer filter set to: %s', self.trainer_name)
 
     def set_hr_name(self, name: str):
         """Change the HR monitor name to search for."""
         self.hr_name = name.upper()
-        print(f"HR monitor filter set to: {self.hr_name}")
+        logger.info('HR monitor filter set to: %s', self.hr_name)
 
     async def scan_for_devices(self, timeout: float = 10.0) -> dict:
-        """Scan for BLE devices and return found cycling devices."""
-        print(f"Scanning for BLE devices for {timeout} seconds...")
+        """Scan for BLE devices and return found cycling devices.
 
-        devices = await BleakScanner.discover(timeout=timeout)
+        Only devices advertising a trainer, power or heart rate service are
+        reported. The scan ends early once both the configured trainer and
+        HR monitor have been seen, otherwise after ``timeout`` seconds.
+        """
+        logger.info('Scanning for BLE devices for up to %s seconds...', timeout)
 
         found = {
             "trainer": None,
@@ -123,54 +263,69 @@ class BLEManager:
         }
 
         self._discovered_trainers = []
+        seen = set()
+        targets_found = asyncio.Event()
+
+        def on_advertisement(device, advertisement_data):
+            # Advertisements repeat; classify each device once it has a name
+            address = device.address
+            if address in seen:
+                return
+            name = device.name or advertisement_data.local_name
+            if not name:
+                return
+            seen.add(address)
 
-        for device in devices:
-            name = device.name or ""
             device_info = {
                 "name": name,
-                "address": device.address
+                "address": address
             }
             found["all_devices"].append(device_info)
 
             # Check if it's a known trainer type
             name_upper = name.upper()
-            is_trainer = False
-            has_erg = True
-
-            for trainer_type, info in self.KNOWN_TRAINERS.items():
-                if trainer_type in name_upper:
-                    is_trainer = True
-                    has_erg = info["has_erg"]
-                    device_info["has_erg"] = has_erg
-                    device_info["type"] = trainer_type
-                    break
-
+            trainer_type = self._classify_trainer(name_upper)
+            if trainer_type:
+                device_info["has_erg"] = self.KNOWN_TRAINERS[trainer_type]["has_erg"]
+                device_info["type"] = trainer_type
             # Also check for generic FTMS or power devices
-            if not is_trainer and ("BIKE" in name_upper or "TRAINER" in name_upper or "POWER" in name_upper):
-                is_trainer = True
+            elif _GENERIC_TRAINER_RE.search(name_upper):
                 device_info["has_erg"] = True  # Assume FTMS capable
                 device_info["type"] = "UNKNOWN"
 
-            if is_trainer:
+            if "type" in device_info:
                 found["trainers"].append(device_info)
                 self._discovered_trainers.append(device_info)
 
             # Check for HR monitors
-            if "HR" in name_upper or "HEART" in name_upper or "MYZONE" in name_upper or "POLAR" in name_upper or "GARMIN" in name_upper or "WAHOO" in name_upper:
+            if _HR_RE.search(name_upper):
                 found["hr_monitors"].append(device_info)
 
             # Auto-select based on configured names
             if self.trainer_name in name_upper:
                 found["trainer"] = device_info
-                self.trainer_address = device.address
+                self.trainer_address = address
                 self.connected_trainer_name = name
                 self._trainer_has_erg = device_info.get("has_erg", True)
-                print(f"Found trainer: {name} ({device.address}) - ERG: {self._trainer_has_erg}")
+                logger.info('Found trainer: %s (%s) - ERG: %s', name, address, self._trainer_has_erg)
 
             if self.hr_name in name_upper:
                 found["hr_monitor"] = device_info
-                self.hr_address = device.address
-                print(f"Found HR monitor: {name} ({device.address})")
+                self.hr_address = address
+                logger.info('Found HR monitor: %s (%s)', name, address)
+
+            if found["trainer"] and found["hr_monitor"]:
+                targets_found.set()
+
+        scanner = BleakScanner(
+            detection_callback=on_advertisement,
+            service_uuids=[FTMS_SERVICE, CYCLING_POWER_SERVICE, HEART_RATE_SERVICE]
+        )
+        async with scanner:
+            try:
+                await asyncio.wait_for(targets_found.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
 
         return found
 
@@ -185,25 +340,25 @@ class BLEManager:
 
         # Check if this device has ERG capability
         name_upper = device_name.upper()
-        self._trainer_has_erg = True  # Default to true
-        for trainer_type, info in self.KNOWN_TRAINERS.items():
-            if trainer_type in name_upper:
-                self._trainer_has_erg = info["has_erg"]
-                break
+        trainer_type = self._classify_trainer(name_upper)
+        self._trainer_has_erg = self.KNOWN_TRAINERS[trainer_type]["has_erg"] if trainer_type else True
 
         return await self.connect_trainer()
 
     async def disconnect_trainer(self):
         """Disconnect from the current trainer."""
+        # A writer still waiting on its first write must not outlive the client
+        self._cancel_erg_writer()
         if self._erg_mode_active:
             await self.stop_erg_mode()
 
         if self.trainer_client and self.trainer_client.is_connected:
             await self.trainer_client.disconnect()
-            print(f"Disconnected from trainer")
+            logger.info('Disconnected from trainer')
 
         self.trainer_client = None
         self._has_control = False
+        self._reset_erg_state()
 
     def get_discovered_trainers(self) -> list:
         """Get list of trainers found in last scan."""
@@ -217,171 +372,113 @@ class BLEManager:
     async def connect_trainer(self) -> bool:
         """Connect to the smart trainer."""
         if not self.trainer_address:
-            print("No trainer address set. Run scan_for_devices first.")
+            logger.warning('No trainer address set. Run scan_for_devices first.')
             return False
 
+        # A new link starts out of ERG mode, even if the old one dropped mid-workout
+        self._cancel_erg_writer()
+        self._reset_erg_state()
+        self._has_control = False
+
         try:
             self.trainer_client = BleakClient(self.trainer_address)
             await self.trainer_client.connect()
-            print(f"Connected to trainer at {self.trainer_address}")
+            logger.info('Connected to trainer at %s', self.trainer_address)
 
-            # Subscribe to indoor bike data (FTMS)
+            # Subscribe to the data characteristics and request ERG control
+            # concurrently so the GATT round-trips overlap
             services = self.trainer_client.services
+            pending = []
+            subscribed = []
 
             # Try FTMS Indoor Bike Data first
-            if FTMS_SERVICE in [str(s.uuid) for s in services]:
-                await self.trainer_client.start_notify(
+            if services.get_service(FTMS_SERVICE) is not None:
+                pending.append(self.trainer_client.start_notify(
                     INDOOR_BIKE_DATA,
                     self._handle_indoor_bike_data
-                )
-                print("Subscribed to FTMS Indoor Bike Data")
+                ))
+                subscribed.append('FTMS Indoor Bike Data')
 
             # Also try Cycling Power if available
-            if CYCLING_POWER_SERVICE in [str(s.uuid) for s in services]:
-                await self.trainer_client.start_notify(
+            if services.get_service(CYCLING_POWER_SERVICE) is not None:
+                pending.append(self.trainer_client.start_notify(
                     CYCLING_POWER_MEASUREMENT,
                     self._handle_cycling_power
-                )
-                print("Subscribed to Cycling Power")
+                ))
+                subscribed.append('Cycling Power')
 
             # Request control for ERG mode
-            await self._request_control()
+            pending.append(self._request_control())
+
+            await asyncio.gather(*pending)
+            for name in subscribed:
+                logger.info('Subscribed to %s', name)
 
             return True
 
         except Exception as e:
-            print(f"Failed to connect to trainer: {e}")
+            logger.error('Failed to connect to trainer: %s', e)
             return False
 
     async def connect_hr_monitor(self) -> bool:
         """Connect to the heart rate monitor."""
         if not self.hr_address:
-            print("No HR monitor address set. Run scan_for_devices first.")
+            logger.warning('No HR monitor address set. Run scan_for_devices first.')
             return False
 
         try:
             self.hr_client = BleakClient(self.hr_address)
             await self.hr_client.connect()
-            print(f"Connected to HR monitor at {self.hr_address}")
+            logger.info('Connected to HR monitor at %s', self.hr_address)
 
             await self.hr_client.start_notify(
                 HEART_RATE_MEASUREMENT,
                 self._handle_hr_measurement
             )
-            print("Subscribed to Heart Rate Measurement")
+            logger.info('Subscribed to Heart Rate Measurement')
 
             return True
 
         except Exception as e:
-            print(f"Failed to connect to HR monitor: {e}")
+            logger.error('Failed to connect to HR monitor: %s', e)
             return False
 
     def _handle_indoor_bike_data(self, sender, data: bytearray):
         """Parse FTMS Indoor Bike Data characteristic."""
-        import time
-
-        # FTMS Indoor Bike Data format
-        # Flags (2 bytes) determine which fields are present
-        flags = struct.unpack('<H', data[0:2])[0]
-        offset = 2
-
-        speed = 0.0
-        cadence = 0
-        power = 0
-
-        # Bit 0: More Data (0 = all data present)
-        # Bit 1: Average Speed present
-        # Bit 2: Instantaneous Cadence present
-        # Bit 3: Average Cadence present
-        # Bit 4: Total Distance present
-        # Bit 5: Resistance Level present
-        # Bit 6: Instantaneous Power present
-        # etc.
-
-        # Instantaneous Speed (always present when bit 0 is 0)
-        if len(data) > offset + 1:
-            speed_raw = struct.unpack('<H', data[offset:offset+2])[0]
-            speed = speed_raw / 100.0  # Convert to km/h
-            offset += 2
-
-        # Skip average speed if present (bit 1)
-        if flags & 0x02:
-            offset += 2
-
-        # Instantaneous Cadence (bit 2)
-        if flags & 0x04:
-            if len(data) > offset + 1:
-                cadence_raw = struct.unpack('<H', data[offset:offset+2])[0]
-                cadence = cadence_raw // 2  # 0.5 RPM resolution
-                offset += 2
-
-        # Skip average cadence if present (bit 3)
-        if flags & 0x08:
-            offset += 2
-
-        # Skip total distance if present (bit 4)
-        if flags & 0x10:
-            offset += 3
-
-        # Skip resistance level if present (bit 5)
-        if flags & 0x20:
-            offset += 2
-
-        # Instantaneous Power (bit 6)
-        if flags & 0x40:
-            if len(data) > offset + 1:
-                power = struct.unpack('<h', data[offset:offset+2])[0]
-                offset += 2
-
-        bike_data = BikeData(
-            power=max(0, power),
-            cadence=cadence,
-            speed=speed,
-            timestamp=time.time()
-        )
-
-        self._last_bike_data = bike_data
+        bike_data = self._last_bike_data
+        bike_data.power, bike_data.cadence, bike_data.speed = _parse_indoor_bike_data(data)
+        bike_data.timestamp = _time()
 
         if self.on_bike_data:
             self.on_bike_data(bike_data)
 
     def _handle_cycling_power(self, sender, data: bytearray):
         """Parse Cycling Power Measurement characteristic."""
-        import time
-
-        # Flags (2 bytes)
-        flags = struct.unpack('<H', data[0:2])[0]
-
-        # Instantaneous Power (2 bytes, always present)
-        power = struct.unpack('<h', data[2:4])[0]
+        # Flags (2 bytes) + Instantaneous Power (2 bytes, always present)
+        flags, power = _CPS_HDR.unpack_from(data, 0)
 
         # Update bike data with power
         self._last_bike_data.power = max(0, power)
-        self._last_bike_data.timestamp = time.time()
+        self._last_bike_data.timestamp = _time()
 
         if self.on_bike_data:
             self.on_bike_data(self._last_bike_data)
 
     def _handle_hr_measurement(self, sender, data: bytearray):
         """Parse Heart Rate Measurement characteristic."""
-        import time
-
         # First byte contains flags
         flags = data[0]
 
         # Bit 0: Heart Rate Value Format
         # 0 = UINT8, 1 = UINT16
         if flags & 0x01:
-            hr = struct.unpack('<H', data[1:3])[0]
+            hr = data[1] | (data[2] << 8)
         else:
             hr = data[1]
 
-        hr_data = HRData(
-            heart_rate=hr,
-            timestamp=time.time()
-        )
-
-        self._last_hr_data = hr_data
+        hr_data = self._last_hr_data
+        hr_data.heart_rate = hr
+        hr_data.timestamp = _time()
 
         if self.on_hr_data:
             self.on_hr_data(hr_data)
@@ -393,51 +490,88 @@ class BLEManager:
 
         try:
             # Request control
-            command = struct.pack('<B', FTMS_REQUEST_CONTROL)
+            command = _CTRL_B.pack(FTMS_REQUEST_CONTROL)
             await self.trainer_client.write_gatt_char(FTMS_CONTROL_POINT, command)
             self._has_control = True
-            print("Acquired trainer control for ERG mode")
+            logger.info('Acquired trainer control for ERG mode')
             return True
         except Exception as e:
-            print(f"Failed to request trainer control: {e}")
+            logger.error('Failed to request trainer control: %s', e)
             return False
 
     async def set_target_power(self, watts: int) -> bool:
-        """Set ERG mode target power in watts."""
+        """Set ERG mode target power in watts.
+
+        The write happens on a background task that sends at most one target
+        every ERG_WRITE_INTERVAL; targets requested in between are coalesced
+        so only the latest one reaches the trainer. Returning True means the
+        target was queued, not that it has been written.
+        """
         if not self.trainer_client or not self.trainer_client.is_connected:
-            print("Trainer not connected")
+            logger.warning('Trainer not connected')
             return False
 
+        self._pending_target = watts
+        if self._erg_writer is None or self._erg_writer.done():
+            self._erg_writer = asyncio.ensure_future(self._write_pending_targets())
+        return True
+
+    async def _write_pending_targets(self):
+        """Drain coalesced target power requests, pacing the control point writes."""
+        while self._pending_target is not None:
+            watts = self._pending_target
+            self._pending_target = None
+            if watts != self._current_target_power or not self._erg_mode_active:
+                await self._write_target_power(watts)
+            await asyncio.sleep(ERG_WRITE_INTERVAL)
+
+    def _cancel_erg_writer(self):
+        """Drop any queued target and cancel the paced writer task."""
+        self._pending_target = None
+        if self._erg_writer is not None and not self._erg_writer.done():
+            self._erg_writer.cancel()
+        self._erg_writer = None
+
+    def _reset_erg_state(self):
+        """Forget the ERG target so the next set_target_power always writes."""
+        self._erg_mode_active = False
+        self._current_target_power = 0
+
+    async def _write_target_power(self, watts: int) -> bool:
+        """Send a Set Target Power command to the trainer."""
         if not self._has_control:
             await self._request_control()
 
         try:
             # FTMS Set Target Power: Op Code (1 byte) + Power (2 bytes, signed little-endian)
-            command = struct.pack('<Bh', FTMS_SET_TARGET_POWER, watts)
-            await self.trainer_client.write_gatt_char(FTMS_CONTROL_POINT, command)
+            _CTRL_BH.pack_into(self._erg_cmd_buf, 0, FTMS_SET_TARGET_POWER, watts)
+            await self.trainer_client.write_gatt_char(FTMS_CONTROL_POINT, self._erg_cmd_buf)
             self._current_target_power = watts
             self._erg_mode_active = True
-            print(f"ERG mode: Target power set to {watts}W")
+            logger.debug('ERG mode: Target power set to %sW', watts)
             return True
         except Exception as e:
-            print(f"Failed to set target power: {e}")
+            logger.error('Failed to set target power: %s', e)
             return False
 
     async def stop_erg_mode(self) -> bool:
         """Stop ERG mode and return to free ride."""
+        # Drop any target still waiting to be written so it can't re-enable ERG
+        self._cancel_erg_writer()
+
         if not self.trainer_client or not self.trainer_client.is_connected:
             return False
 
         try:
             # Send reset command to exit ERG mode
-            command = struct.pack('<B', FTMS_RESET)
+            command = _CTRL_B.pack(FTMS_RESET)
             await self.trainer_client.write_gatt_char(FTMS_CONTROL_POINT, command)
             self._erg_mode_active = False
             self._current_target_power = 0
-            print("ERG mode disabled - free ride")
+            logger.info('ERG mode disabled - free ride')
             return True
         except Exception as e:
-            print(f"Failed to stop ERG mode: {e}")
+            logger.error('Failed to stop ERG mode: %s', e)
             return False
 
     @property
@@ -450,17 +584,20 @@ class BLEManager:
 
     async def disconnect(self):
         """Disconnect from all devices."""
+        # A writer still waiting on its first write must not outlive the client
+        self._cancel_erg_writer()
         # Stop ERG mode before disconnecting
         if self._erg_mode_active:
             await self.stop_erg_mode()
+        self._reset_erg_state()
 
         if self.trainer_client and self.trainer_client.is_connected:
             await self.trainer_client.disconnect()
-            print("Disconnected from trainer")
+            logger.info('Disconnected from trainer')
 
         if self.hr_client and self.hr_client.is_connected:
             await self.hr_client.disconnect()
-            print("Disconnected from HR monitor")
+            logger.info('Disconnected from HR monitor')
 
     @property
     def is_trainer_connected(self) -> bool:
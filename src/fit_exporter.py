@@ -4,19 +4,80 @@ FIT File Exporter - generates .fit files compatible with Strava and COROS.
 
 import datetime
 import struct
-from dataclasses import dataclass
-from typing import List, Optional
+from array import array
+from functools import lru_cache
+from typing import Optional
 import os
 
+import numpy as np
+
+# Precompiled FIT layouts (all little-endian)
+_U16 = struct.Struct('<H')
+_HEADER_NO_CRC = struct.Struct('<BBHI4s')  # size, protocol, profile, data size, '.FIT'
+_DEFINITION = struct.Struct('<BBBHB')  # header, reserved, architecture, global msg, num fields
+_FIELD_DEF = struct.Struct('<BBB')  # field number, size, base type
+_FILE_ID_DATA = struct.Struct('<BBHHI')
+_EVENT_DATA = struct.Struct('<BIBB')
+_LAP_DATA = struct.Struct('<BIIIIBH')
+_SESSION_DATA = struct.Struct('<BIIIIBBH')
+_ACTIVITY_DATA = struct.Struct('<BIIHB')
+
+# Record data messages are serialized together as a packed structured array
+_RECORD_DTYPE = np.dtype([
+    ('header', 'u1'),
+    ('timestamp', '<u4'),
+    ('heart_rate', 'u1'),
+    ('cadence', 'u1'),
+    ('power', '<u2'),
+    ('speed', '<u2'),
+])
+
+# Binary backup log: header (magic, start time) then fixed-size records of
+# timestamp, heart_rate, power, cadence, speed
+_BACKUP_MAGIC = b'Z2BK'
+_BACKUP_HEADER = struct.Struct('<4s4xd')
+_BACKUP_RECORD = struct.Struct('<dHHHd')
+
+_FIT_EPOCH_UNIX = 631065600  # seconds from the Unix epoch to 1989-12-31 00:00:00 UTC
+
+
+def _build_crc_table() -> tuple:
+    """Expand the FIT SDK's 4-bit CRC-16 table into a byte-at-a-time table."""
+    nibble_table = (
+        0x0000, 0xCC01, 0xD801, 0x1400, 0xF001, 0x3C00, 0x2800, 0xE401,
+        0xA001, 0x6C00, 0x7800, 0xB401, 0x5000, 0x9C01, 0x8801, 0x4400
+    )
+    table = []
+    for byte in range(256):
+        crc = 0
+        for nibble in (byte & 0xF, byte >> 4):
+            tmp = nibble_table[crc & 0xF]
+            crc = (crc >> 4) & 0x0FFF
+            crc = crc ^ tmp ^ nibble_table[nibble]
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _build_crc_table()
+
 
-@dataclass
-class FitRecord:
-    """A single data record for the FIT file."""
-    timestamp: float  # Unix timestamp
-    heart_rate: int  # bpm
-    power: int  # watts
-    cadence: int  # rpm
-    speed: float  # m/s
+def _build_slice_tables() -> tuple:
+    """Derive the slice-by-8 tables: table k advances a byte's CRC k more bytes."""
+    tables = [_CRC_TABLE]
+    for _ in range(7):
+        prev = tables[-1]
+        tables.append(tuple((prev[b] >> 8) ^ _CRC_TABLE[prev[b] & 0xFF] for b in range(256)))
+    return tuple(tables)
+
+
+_CRC_SLICE_TABLES = _build_slice_tables()
+_CRC_BLOCK = struct.Struct('<HBBBBBB')  # 8 input bytes: first two combine with the CRC
+
+
+def _definition_message(local_type: int, global_msg: int, fields: tuple) -> bytes:
+    """Encode a definition message from (field number, size, base type) triples."""
+    return (_DEFINITION.pack(0x40 | local_type, 0, 0, global_msg, len(fields)) +
+            b''.join(_FIELD_DEF.pack(*field) for field in fields))
 
 
 class FitExporter:
@@ -53,14 +114,69 @@ class FitExporter:
     TYPE_UINT16Z = 139
     TYPE_UINT32Z = 140
 
+    # Definition messages are constant, so they are encoded once at import
+    _DEF_FILE_ID = _definition_message(0, MSG_FILE_ID, (
+        (0, 1, TYPE_ENUM),  # type
+        (1, 2, TYPE_UINT16),  # manufacturer
+        (2, 2, TYPE_UINT16),  # product
+        (3, 4, TYPE_UINT32Z),  # serial_number
+    ))
+    _DEF_RECORD = _definition_message(1, MSG_RECORD, (
+        (253, 4, TYPE_UINT32),  # timestamp
+        (3, 1, TYPE_UINT8),  # heart_rate
+        (4, 1, TYPE_UINT8),  # cadence
+        (7, 2, TYPE_UINT16),  # power
+        (6, 2, TYPE_UINT16),  # speed (enhanced)
+    ))
+    _DEF_EVENT = _definition_message(2, MSG_EVENT, (
+        (253, 4, TYPE_UINT32),  # timestamp
+        (0, 1, TYPE_ENUM),  # event
+        (1, 1, TYPE_ENUM),  # event_type
+    ))
+    _DEF_LAP = _definition_message(3, MSG_LAP, (
+        (253, 4, TYPE_UINT32),  # timestamp
+        (2, 4, TYPE_UINT32),  # start_time
+        (7, 4, TYPE_UINT32),  # total_elapsed_time
+        (8, 4, TYPE_UINT32),  # total_timer_time
+        (15, 1, TYPE_UINT8),  # avg_heart_rate
+        (19, 2, TYPE_UINT16),  # avg_power
+    ))
+    _DEF_SESSION = _definition_message(4, MSG_SESSION, (
+        (253, 4, TYPE_UINT32),  # timestamp
+        (2, 4, TYPE_UINT32),  # start_time
+        (7, 4, TYPE_UINT32),  # total_elapsed_time
+        (8, 4, TYPE_UINT32),  # total_timer_time
+        (5, 1, TYPE_ENUM),  # sport
+        (16, 1, TYPE_UINT8),  # avg_heart_rate
+        (20, 2, TYPE_UINT16),  # avg_power
+    ))
+    _DEF_ACTIVITY = _definition_message(5, MSG_ACTIVITY, (
+        (253, 4, TYPE_UINT32),  # timestamp
+        (0, 4, TYPE_UINT32),  # total_timer_time
+        (1, 2, TYPE_UINT16),  # num_sessions
+        (2, 1, TYPE_ENUM),  # type
+    ))
+
     def __init__(self, backup_dir: str = 'workouts'):
-        self._records: List[FitRecord] = []
+        self._reset_samples()
         self._start_time: Optional[float] = None
         self._end_time: Optional[float] = None
         self._backup_dir = backup_dir
         self._backup_file: Optional[str] = None
+        self._backup_fp = None  # Open binary backup log, appended every 30 records
         self._last_backup_count = 0
 
+    def _reset_samples(self):
+        """Start empty per-field sample columns and running totals."""
+        self._timestamps = array('d')  # Unix time
+        self._heart_rates = array('H')  # bpm
+        self._powers = array('H')  # watts
+        self._cadences = array('H')  # rpm
+        self._speeds = array('d')  # m/s
+        # Running sums for the lap/session averages
+        self._heart_rate_sum = 0
+        self._power_sum = 0
+
     def add_record(self, timestamp: float, heart_rate: int, power: int,
                    cadence: int, speed: float):
         """Add a data record to the workout."""
@@ -69,61 +185,71 @@ class FitExporter:
             # Create backup file path when workout starts
             os.makedirs(self._backup_dir, exist_ok=True)
             ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-            self._backup_file = os.path.join(self._backup_dir, f'.backup_{ts}.json')
+            self._backup_file = os.path.join(self._backup_dir, f'.backup_{ts}.bin')
 
-        self._end_time = timestamp
-        self._records.append(FitRecord(
-            timestamp=timestamp,
-            heart_rate=heart_rate,
-            power=power,
-            cadence=cadence,
-            speed=speed
-        ))
+        self._append_sample(timestamp, heart_rate, power, cadence, speed)
 
         # Auto-save every 30 records (~30 seconds of data)
-        if len(self._records) - self._last_backup_count >= 30:
+        if len(self._timestamps) - self._last_backup_count >= 30:
             self._save_backup()
 
+    def _append_sample(self, timestamp: float, heart_rate: int, power: int,
+                       cadence: int, speed: float):
+        """Append one sample to the columns and running totals."""
+        # The 'H' columns hold uint16; clamp like the FIT power field
+        heart_rate = min(65535, heart_rate)
+        power = min(65535, power)
+        cadence = min(65535, cadence)
+        self._end_time = timestamp
+        self._timestamps.append(timestamp)
+        self._heart_rates.append(heart_rate)
+        self._powers.append(power)
+        self._cadences.append(cadence)
+        self._speeds.append(speed)
+        self._heart_rate_sum += heart_rate
+        self._power_sum += power
+
     def _save_backup(self):
-        """Save backup of current records to JSON file."""
-        if not self._backup_file or not self._records:
-            return
-
-        import json
-        backup_data = {
-            'start_time': self._start_time,
-            'end_time': self._end_time,
-            'records': [
-                {
-                    'timestamp': r.timestamp,
-                    'heart_rate': r.heart_rate,
-                    'power': r.power,
-                    'cadence': r.cadence,
-                    'speed': r.speed
-                }
-                for r in self._records
-            ]
-        }
+        """Append records added since the last backup to the binary backup log."""
+        start = self._last_backup_count
+        end = len(self._timestamps)
+        if not self._backup_file or start == end:
+            return  # Nothing new since the last checkpoint
+
+        buf = b''.join(map(
+            _BACKUP_RECORD.pack,
+            self._timestamps[start:], self._heart_rates[start:], self._powers[start:],
+            self._cadences[start:], self._speeds[start:]
+        ))
 
         try:
-            with open(self._backup_file, 'w') as f:
-                json.dump(backup_data, f)
-            self._last_backup_count = len(self._records)
+            if self._backup_fp is None:
+                self._backup_fp = open(self._backup_file, 'wb')
+                self._backup_fp.write(_BACKUP_HEADER.pack(_BACKUP_MAGIC, self._start_time))
+            self._backup_fp.write(buf)
+            self._backup_fp.flush()
+            self._last_backup_count = end
         except Exception as e:
             print(f"Backup save failed: {e}")
 
     def load_backup(self, backup_file: str) -> bool:
         """Load records from a backup file."""
-        import json
         try:
-            with open(backup_file, 'r') as f:
-                data = json.load(f)
-
-            self._start_time = data['start_time']
-            self._end_time = data['end_time']
-            self._records = [
-                FitRecord(**r) for r in data['records']
-            ]
+            with open(backup_file, 'rb') as f:
+                data = f.read()
+
+            magic, start_time = _BACKUP_HEADER.unpack_from(data, 0)
+            if magic != _BACKUP_MAGIC:
+                raise ValueError("not a workout backup")
+            body = memoryview(data)[_BACKUP_HEADER.size:]
+            # Drop a partially written trailing record
+            body = body[:len(body) - len(body) % _BACKUP_RECORD.size]
+
+            self._reset_samples()
+            self._start_time = start_time
+            self._end_time = start_time
+            for record in _BACKUP_RECORD.iter_unpack(body):
+                self._append_sample(*record)
             return True
         except Exception as e:
             print(f"Failed to load backup: {e}")
@@ -131,6 +257,9 @@ class FitExporter:
 
     def cleanup_backup(self):
         """Remove backup file after successful export."""
+        if self._backup_fp is not None:
+            self._backup_fp.close()
+            self._backup_fp = None
         if self._backup_file and os.path.exists(self._backup_file):
             try:
                 os.remove(self._backup_file)
@@ -141,7 +270,7 @@ class FitExporter:
 
     def clear(self):
         """Clear all records."""
-        self._records.clear()
+        self._reset_samples()
         self._start_time = None
         self._end_time = None
         self.cleanup_backup()
@@ -151,7 +280,7 @@ class FitExporter:
         Export the workout to a FIT file.
         Returns the full path to the created file.
         """
-        if not self._records:
+        if not self._timestamps:
             raise ValueError("No records to export")
 
         # Ensure .fit extension
@@ -182,270 +311,170 @@ class FitExporter:
         # File header
         header = self._build_header(len(data_records))
 
-        # Calculate CRC
-        full_data = header + data_records
-        crc = self._calculate_crc(full_data)
-
-        return full_data + struct.pack('<H', crc)
+        # Calculate CRC over header then records without concatenating them
+        crc = self._calculate_crc(data_records, self._calculate_crc(header))
 
-    def _build_header(self, data_size: int) -> bytes:
-        """Build 14-byte FIT file header."""
-        header_size = 14
-        protocol_version = self.FIT_PROTOCOL_VERSION
-        profile_version = self.FIT_PROFILE_VERSION
+        return b''.join((header, data_records, _U16.pack(crc)))
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _build_header(data_size: int) -> bytes:
+        """Build 14-byte FIT file header (cached; only data_size varies)."""
         # Build header without CRC first (12 bytes)
-        header_no_crc = struct.pack('<B', header_size)  # Header size (1 byte)
-        header_no_crc += struct.pack('<B', protocol_version)  # Protocol version (1 byte)
-        header_no_crc += struct.pack('<H', profile_version)  # Profile version (2 bytes)
-        header_no_crc += struct.pack('<I', data_size)  # Data size (4 bytes)
-        header_no_crc += b'.FIT'  # Data type (4 bytes)
+        header_no_crc = _HEADER_NO_CRC.pack(
+            14,  # Header size (1 byte)
+            FitExporter.FIT_PROTOCOL_VERSION,  # Protocol version (1 byte)
+            FitExporter.FIT_PROFILE_VERSION,  # Profile version (2 bytes)
+            data_size,  # Data size (4 bytes)
+            b'.FIT'  # Data type (4 bytes)
+        )
 
         # Add header CRC (2 bytes)
-        header = header_no_crc + struct.pack('<H', self._calculate_crc(header_no_crc))
-
-        return header
+        return header_no_crc + _U16.pack(FitExporter._calculate_crc(header_no_crc))
 
     def _build_data_records(self) -> bytes:
         """Build all data records."""
-        data = b''
-
-        # Definition messages (local message types)
-        # File ID definition and data
-        data += self._build_file_id()
-
-        # Event (start) definition and data
-        data += self._build_event(event_type=0, event=0)  # Timer start
+        return b''.join((
+            # Definition messages (local message types)
+            # File ID definition and data
+            self._build_file_id(),
 
-        # Record definition
-        data += self._build_record_definition()
+            # Event (start) definition and data
+            self._build_event(event_type=0, event=0),  # Timer start
 
-        # Record data for each sample
-        for record in self._records:
-            data += self._build_record_data(record)
+            # Record definition
+            self._build_record_definition(),
 
-        # Event (stop)
-        data += self._build_event(event_type=1, event=0)  # Timer stop
+            # Record data for all samples in one block
+            self._build_record_data(),
 
-        # Lap
-        data += self._build_lap()
+            # Event (stop)
+            self._build_event(event_type=1, event=0),  # Timer stop
 
-        # Session
-        data += self._build_session()
+            # Lap
+            self._build_lap(),
 
-        # Activity
-        data += self._build_activity()
+            # Session
+            self._build_session(),
 
-        return data
+            # Activity
+            self._build_activity(),
+        ))
 
     def _build_file_id(self) -> bytes:
         """Build File ID message (required first message)."""
-        # Definition message
-        definition = struct.pack('<B', 0x40)  # Definition message, local type 0
-        definition += struct.pack('<B', 0)  # Reserved
-        definition += struct.pack('<B', 0)  # Architecture (0 = little endian)
-        definition += struct.pack('<H', self.MSG_FILE_ID)  # Global message number
-        definition += struct.pack('<B', 4)  # Number of fields
-
-        # Fields: type, manufacturer, product, serial_number
-        definition += struct.pack('<BBB', 0, 1, self.TYPE_ENUM)  # type
-        definition += struct.pack('<BBB', 1, 2, self.TYPE_UINT16)  # manufacturer
-        definition += struct.pack('<BBB', 2, 2, self.TYPE_UINT16)  # product
-        definition += struct.pack('<BBB', 3, 4, self.TYPE_UINT32Z)  # serial_number
-
         # Data message
-        data = struct.pack('<B', 0x00)  # Data message, local type 0
-        data += struct.pack('<B', 4)  # type = activity
-        data += struct.pack('<H', 1)  # manufacturer = Garmin (for compatibility)
-        data += struct.pack('<H', 1)  # product
-        data += struct.pack('<I', 12345)  # serial number
+        data = _FILE_ID_DATA.pack(
+            0x00,  # Data message, local type 0
+            4,  # type = activity
+            1,  # manufacturer = Garmin (for compatibility)
+            1,  # product
+            12345  # serial number
+        )
 
-        return definition + data
+        return self._DEF_FILE_ID + data
 
     def _build_record_definition(self) -> bytes:
         """Build Record definition message."""
-        definition = struct.pack('<B', 0x41)  # Definition message, local type 1
-        definition += struct.pack('<B', 0)  # Reserved
-        definition += struct.pack('<B', 0)  # Architecture (little endian)
-        definition += struct.pack('<H', self.MSG_RECORD)  # Global message number
-        definition += struct.pack('<B', 5)  # Number of fields
-
-        # Fields: timestamp, heart_rate, cadence, power, speed
-        definition += struct.pack('<BBB', 253, 4, self.TYPE_UINT32)  # timestamp
-        definition += struct.pack('<BBB', 3, 1, self.TYPE_UINT8)  # heart_rate
-        definition += struct.pack('<BBB', 4, 1, self.TYPE_UINT8)  # cadence
-        definition += struct.pack('<BBB', 7, 2, self.TYPE_UINT16)  # power
-        definition += struct.pack('<BBB', 6, 2, self.TYPE_UINT16)  # speed (enhanced)
-
-        return definition
-
-    def _build_record_data(self, record: FitRecord) -> bytes:
-        """Build a single record data message."""
-        # Convert timestamp to FIT timestamp (seconds since 1989-12-31)
-        fit_epoch = datetime.datetime(1989, 12, 31, tzinfo=datetime.timezone.utc)
-        record_time = datetime.datetime.fromtimestamp(record.timestamp, tz=datetime.timezone.utc)
-        fit_timestamp = int((record_time - fit_epoch).total_seconds())
-
+        return self._DEF_RECORD
+
+    def _build_record_data(self) -> bytes:
+        """Build the record data messages for every sample in one vectorized pass."""
+        block = np.empty(len(self._timestamps), dtype=_RECORD_DTYPE)
+        block['header'] = 0x01  # Data message, local type 1
+        # FIT timestamp: seconds since 1989-12-31 00:00:00 UTC
+        np.subtract(np.frombuffer(self._timestamps, np.float64), _FIT_EPOCH_UNIX,
+                    out=block['timestamp'], casting='unsafe')
+        # Saturate straight into the packed uint8 fields, no temporaries
+        np.minimum(np.frombuffer(self._heart_rates, np.uint16), 255,
+                   out=block['heart_rate'], casting='unsafe')
+        np.minimum(np.frombuffer(self._cadences, np.uint16), 255,
+                   out=block['cadence'], casting='unsafe')
+        block['power'] = np.frombuffer(self._powers, np.uint16)
         # Speed in mm/s (FIT uses enhanced speed in 1/1000 m/s)
-        speed_mms = int(record.speed * 1000)
+        speed = np.frombuffer(self._speeds, np.float64) * 1000
+        np.minimum(speed, 65535, out=speed)
+        block['speed'] = speed
 
-        data = struct.pack('<B', 0x01)  # Data message, local type 1
-        data += struct.pack('<I', fit_timestamp)  # timestamp
-        data += struct.pack('<B', min(255, record.heart_rate))  # heart_rate
-        data += struct.pack('<B', min(255, record.cadence))  # cadence
-        data += struct.pack('<H', min(65535, record.power))  # power
-        data += struct.pack('<H', min(65535, speed_mms))  # speed
-
-        return data
+        return block.tobytes()
 
     def _build_event(self, event_type: int, event: int) -> bytes:
         """Build Event message (start/stop)."""
-        # Definition
-        definition = struct.pack('<B', 0x42)  # Definition message, local type 2
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<H', self.MSG_EVENT)
-        definition += struct.pack('<B', 3)
-
-        definition += struct.pack('<BBB', 253, 4, self.TYPE_UINT32)  # timestamp
-        definition += struct.pack('<BBB', 0, 1, self.TYPE_ENUM)  # event
-        definition += struct.pack('<BBB', 1, 1, self.TYPE_ENUM)  # event_type
-
-        # Data
-        fit_epoch = datetime.datetime(1989, 12, 31, tzinfo=datetime.timezone.utc)
         ts = self._start_time if event_type == 0 else self._end_time
-        record_time = datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc)
-        fit_timestamp = int((record_time - fit_epoch).total_seconds())
+        fit_timestamp = int(ts) - _FIT_EPOCH_UNIX
 
-        data = struct.pack('<B', 0x02)
-        data += struct.pack('<I', fit_timestamp)
-        data += struct.pack('<B', event)  # event (0 = timer)
-        data += struct.pack('<B', event_type)  # event_type (0 = start, 1 = stop)
+        data = _EVENT_DATA.pack(
+            0x02,
+            fit_timestamp,
+            event,  # event (0 = timer)
+            event_type  # event_type (0 = start, 1 = stop)
+        )
 
-        return definition + data
+        return self._DEF_EVENT + data
 
-    def _build_lap(self) -> bytes:
-        """Build Lap message."""
-        definition = struct.pack('<B', 0x43)  # Definition message, local type 3
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<H', self.MSG_LAP)
-        definition += struct.pack('<B', 6)
-
-        definition += struct.pack('<BBB', 253, 4, self.TYPE_UINT32)  # timestamp
-        definition += struct.pack('<BBB', 2, 4, self.TYPE_UINT32)  # start_time
-        definition += struct.pack('<BBB', 7, 4, self.TYPE_UINT32)  # total_elapsed_time
-        definition += struct.pack('<BBB', 8, 4, self.TYPE_UINT32)  # total_timer_time
-        definition += struct.pack('<BBB', 15, 1, self.TYPE_UINT8)  # avg_heart_rate
-        definition += struct.pack('<BBB', 19, 2, self.TYPE_UINT16)  # avg_power
-
-        # Calculate stats
-        fit_epoch = datetime.datetime(1989, 12, 31, tzinfo=datetime.timezone.utc)
-        start_time = datetime.datetime.fromtimestamp(self._start_time, tz=datetime.timezone.utc)
-        end_time = datetime.datetime.fromtimestamp(self._end_time, tz=datetime.timezone.utc)
-        fit_start = int((start_time - fit_epoch).total_seconds())
-        fit_end = int((end_time - fit_epoch).total_seconds())
+    def _summary_fields(self) -> tuple:
+        """Fields shared by Lap and Session: end, start, elapsed ms x2, avg HR, avg power."""
+        fit_start = int(self._start_time) - _FIT_EPOCH_UNIX
+        fit_end = int(self._end_time) - _FIT_EPOCH_UNIX
         elapsed_ms = int((self._end_time - self._start_time) * 1000)
 
-        avg_hr = int(sum(r.heart_rate for r in self._records) / len(self._records)) if self._records else 0
-        avg_power = int(sum(r.power for r in self._records) / len(self._records)) if self._records else 0
+        n = len(self._timestamps)
+        avg_hr = int(self._heart_rate_sum / n) if n else 0
+        avg_power = int(self._power_sum / n) if n else 0
 
-        data = struct.pack('<B', 0x03)
-        data += struct.pack('<I', fit_end)
-        data += struct.pack('<I', fit_start)
-        data += struct.pack('<I', elapsed_ms)
-        data += struct.pack('<I', elapsed_ms)
-        data += struct.pack('<B', min(255, avg_hr))
-        data += struct.pack('<H', min(65535, avg_power))
+        return fit_end, fit_start, elapsed_ms, elapsed_ms, min(255, avg_hr), min(65535, avg_power)
 
-        return definition + data
+    def _build_lap(self) -> bytes:
+        """Build Lap message."""
+        return self._DEF_LAP + _LAP_DATA.pack(0x03, *self._summary_fields())
 
     def _build_session(self) -> bytes:
         """Build Session message."""
-        definition = struct.pack('<B', 0x44)  # Definition message, local type 4
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<H', self.MSG_SESSION)
-        definition += struct.pack('<B', 7)
-
-        definition += struct.pack('<BBB', 253, 4, self.TYPE_UINT32)  # timestamp
-        definition += struct.pack('<BBB', 2, 4, self.TYPE_UINT32)  # start_time
-        definition += struct.pack('<BBB', 7, 4, self.TYPE_UINT32)  # total_elapsed_time
-        definition += struct.pack('<BBB', 8, 4, self.TYPE_UINT32)  # total_timer_time
-        definition += struct.pack('<BBB', 5, 1, self.TYPE_ENUM)  # sport
-        definition += struct.pack('<BBB', 16, 1, self.TYPE_UINT8)  # avg_heart_rate
-        definition += struct.pack('<BBB', 20, 2, self.TYPE_UINT16)  # avg_power
-
-        fit_epoch = datetime.datetime(1989, 12, 31, tzinfo=datetime.timezone.utc)
-        start_time = datetime.datetime.fromtimestamp(self._start_time, tz=datetime.timezone.utc)
-        end_time = datetime.datetime.fromtimestamp(self._end_time, tz=datetime.timezone.utc)
-        fit_start = int((start_time - fit_epoch).total_seconds())
-        fit_end = int((end_time - fit_epoch).total_seconds())
-        elapsed_ms = int((self._end_time - self._start_time) * 1000)
-
-        avg_hr = int(sum(r.heart_rate for r in self._records) / len(self._records)) if self._records else 0
-        avg_power = int(sum(r.power for r in self._records) / len(self._records)) if self._records else 0
-
-        data = struct.pack('<B', 0x04)
-        data += struct.pack('<I', fit_end)
-        data += struct.pack('<I', fit_start)
-        data += struct.pack('<I', elapsed_ms)
-        data += struct.pack('<I', elapsed_ms)
-        data += struct.pack('<B', 2)  # sport = cycling
-        data += struct.pack('<B', min(255, avg_hr))
-        data += struct.pack('<H', min(65535, avg_power))
-
-        return definition + data
+        fit_end, fit_start, elapsed_ms, timer_ms, avg_hr, avg_power = self._summary_fields()
+        return self._DEF_SESSION + _SESSION_DATA.pack(
+            0x04,
+            fit_end,
+            fit_start,
+            elapsed_ms,
+            timer_ms,
+            2,  # sport = cycling
+            avg_hr,
+            avg_power
+        )
 
     def _build_activity(self) -> bytes:
         """Build Activity message."""
-        definition = struct.pack('<B', 0x45)  # Definition message, local type 5
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<B', 0)
-        definition += struct.pack('<H', self.MSG_ACTIVITY)
-        definition += struct.pack('<B', 4)
-
-        definition += struct.pack('<BBB', 253, 4, self.TYPE_UINT32)  # timestamp
-        definition += struct.pack('<BBB', 0, 4, self.TYPE_UINT32)  # total_timer_time
-        definition += struct.pack('<BBB', 1, 2, self.TYPE_UINT16)  # num_sessions
-        definition += struct.pack('<BBB', 2, 1, self.TYPE_ENUM)  # type
-
-        fit_epoch = datetime.datetime(1989, 12, 31, tzinfo=datetime.timezone.utc)
-        end_time = datetime.datetime.fromtimestamp(self._end_time, tz=datetime.timezone.utc)
-        fit_end = int((end_time - fit_epoch).total_seconds())
+        fit_end = int(self._end_time) - _FIT_EPOCH_UNIX
         elapsed_ms = int((self._end_time - self._start_time) * 1000)
 
-        data = struct.pack('<B', 0x05)
-        data += struct.pack('<I', fit_end)
-        data += struct.pack('<I', elapsed_ms)
-        data += struct.pack('<H', 1)  # num_sessions
-        data += struct.pack('<B', 0)  # type = manual
-
-        return definition + data
+        return self._DEF_ACTIVITY + _ACTIVITY_DATA.pack(
+            0x05,
+            fit_end,
+            elapsed_ms,
+            1,  # num_sessions
+            0  # type = manual
+        )
 
-    def _calculate_crc(self, data: bytes) -> int:
-        """Calculate FIT CRC-16."""
-        crc_table = [
-            0x0000, 0xCC01, 0xD801, 0x1400, 0xF001, 0x3C00, 0x2800, 0xE401,
-            0xA001, 0x6C00, 0x7800, 0xB401, 0x5000, 0x9C01, 0x8801, 0x4400
-        ]
-
-        crc = 0
-        for byte in data:
-            tmp = crc_table[crc & 0xF]
-            crc = (crc >> 4) & 0x0FFF
-            crc = crc ^ tmp ^ crc_table[byte & 0xF]
-
-            tmp = crc_table[crc & 0xF]
-            crc = (crc >> 4) & 0x0FFF
-            crc = crc ^ tmp ^ crc_table[(byte >> 4) & 0xF]
+    @staticmethod
+    def _calculate_crc(data: bytes, crc: int = 0) -> int:
+        """Calculate FIT CRC-16 (slice-by-8, byte-at-a-time for the tail).
 
+        Pass the CRC of preceding bytes as ``crc`` to continue a running CRC.
+        """
+        t0, t1, t2, t3, t4, t5, t6, t7 = _CRC_SLICE_TABLES
+        bulk = len(data) & ~7
+        for lo, b2, b3, b4, b5, b6, b7 in _CRC_BLOCK.iter_unpack(memoryview(data)[:bulk]):
+            crc ^= lo
+            crc = (t7[crc & 0xFF] ^ t6[crc >> 8] ^ t5[b2] ^ t4[b3] ^
+                   t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+        for byte in data[bulk:]:
+            crc = (crc >> 8) ^ t0[(crc ^ byte) & 0xFF]
         return crc
 
     @property
     def record_count(self) -> int:
         """Get number of recorded data points."""
-        return len(self._records)
+        return len(self._timestamps)
 
     @property
     def duration_seconds(self) -> float:
@@ -3,10 +3,15 @@ Workout Manager - handles structured workouts with ERG mode.
 Supports warmup ramps, steady-state intervals, and cooldowns.
 """
 
+import bisect
+import math
 import time
-from dataclasses import dataclass, field
-from typing import List, Optional, Callable, Dict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Optional, Callable, Dict, Tuple
 from enum import Enum
+from collections import deque
+import numpy as np
 
 
 class WorkoutPhase(Enum):
@@ -26,39 +31,122 @@ class WorkoutType(Enum):
     TEMPO = "tempo"
 
 
-# Workout definitions with metadata
+# Workout definitions with metadata. "structure" lists the segments as
+# (name, count, seconds, start FTP ratio, end FTP ratio, phase[, between]) rows:
+# the row is repeated `count` times with {i} in the name numbered from 1, and
+# the optional `between` row (name, seconds, start, end, phase) is inserted
+# between consecutive repeats.
 WORKOUT_LIBRARY: Dict[str, dict] = {
     "zone2": {
         "name": "Zone 2 (HR Targeted)",
         "description": "HR-targeted endurance - power auto-adjusts to keep HR in zone",
         "frequency_hint": "Power auto-adjusts to maintain target HR",
         "duration_minutes": 60,
-        "intensity": "Low"
+        "intensity": "Low",
+        # 5min warmup, 50min steady Z2, 5min cooldown
+        "structure": [
+            ("Warmup", 1, 5 * 60, 0.40, 0.65, "warmup"),
+            ("Zone 2", 1, 50 * 60, 0.65, 0.65, "main"),
+            ("Cooldown", 1, 5 * 60, 0.65, 0.40, "cooldown"),
+        ]
     },
     "vo2max": {
         "name": "VO2max Intervals",
         "description": "5x3min hard intervals - builds aerobic capacity (1x/week if only cycling once)",
         "frequency_hint": "1x per week - best if only doing 1 cycling session",
         "duration_minutes": 35,
-        "intensity": "High"
+        "intensity": "High",
+        # 5min warmup, 5x(3min @ 120% + 3min recovery), 5min cooldown
+        "structure": [
+            ("Warmup", 1, 5 * 60, 0.40, 0.65, "warmup"),
+            ("Interval {i}", 5, 3 * 60, 1.20, 1.20, "interval",
+             ("Recovery {i}", 3 * 60, 0.50, 0.50, "recovery")),
+            ("Cooldown", 1, 5 * 60, 0.50, 0.40, "cooldown"),
+        ]
     },
     "sweet_spot": {
         "name": "Sweet Spot",
         "description": "2x20min @ 88-93% FTP - efficient endurance builder (1x/week)",
         "frequency_hint": "1x per week alongside Zone 2 sessions",
         "duration_minutes": 55,
-        "intensity": "Medium-High"
+        "intensity": "Medium-High",
+        # 5min warmup, 2x(20min @ 90% FTP + 5min recovery), 5min cooldown
+        "structure": [
+            ("Warmup", 1, 5 * 60, 0.40, 0.65, "warmup"),
+            ("Sweet Spot {i}", 2, 20 * 60, 0.90, 0.90, "main",
+             ("Recovery", 5 * 60, 0.55, 0.55, "recovery")),
+            ("Cooldown", 1, 5 * 60, 0.55, 0.40, "cooldown"),
+        ]
     },
     "tempo": {
         "name": "Tempo/Threshold",
         "description": "2x15min @ 95-100% FTP - lactate tolerance (1x/week)",
         "frequency_hint": "1x per week alongside Zone 2 sessions",
         "duration_minutes": 45,
-        "intensity": "High"
+        "intensity": "High",
+        # 5min warmup, 2x(15min @ 97% FTP + 5min recovery), 5min cooldown
+        "structure": [
+            ("Warmup", 1, 5 * 60, 0.40, 0.65, "warmup"),
+            ("Tempo {i}", 2, 15 * 60, 0.97, 0.97, "main",
+             ("Recovery", 5 * 60, 0.55, 0.55, "recovery")),
+            ("Cooldown", 1, 5 * 60, 0.55, 0.40, "cooldown"),
+        ]
     }
 }
 
 
+# Phase <-> small int id, used by the segment schedule arrays
+_PHASE_BY_ID = tuple(WorkoutPhase)
+_PHASE_IDS = {phase: i for i, phase in enumerate(_PHASE_BY_ID)}
+_MAIN_PHASE_ID = _PHASE_IDS[WorkoutPhase.MAIN]
+
+# One row per segment: duration and target power at segment start/end as a fraction of FTP
+_TEMPLATE_DTYPE = np.dtype([('dur', 'i4'), ('sr', 'f8'), ('er', 'f8'), ('phase', 'i1')])
+
+
+def _compile_structure(structure: list) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Expand a WORKOUT_LIBRARY structure into segment names and a schedule array."""
+    names = []
+    rows = []
+    for name, count, dur, sr, er, phase, *between in structure:
+        for i in range(1, count + 1):
+            if i > 1 and between:
+                b_name, b_dur, b_sr, b_er, b_phase = between[0]
+                names.append(b_name.format(i=i - 1))
+                rows.append((b_dur, b_sr, b_er, _PHASE_IDS[WorkoutPhase(b_phase)]))
+            names.append(name.format(i=i))
+            rows.append((dur, sr, er, _PHASE_IDS[WorkoutPhase(phase)]))
+    return tuple(names), np.array(rows, dtype=_TEMPLATE_DTYPE)
+
+
+# Segment schedule of each workout type, scaled to the rider's FTP at build time
+_TEMPLATES: Dict[str, Tuple[Tuple[str, ...], np.ndarray]] = {
+    workout_type: _compile_structure(spec["structure"])
+    for workout_type, spec in WORKOUT_LIBRARY.items()
+}
+
+
+def _workout_tick(starts: np.ndarray, ends: np.ndarray, durs: np.ndarray, cum: np.ndarray,
+                  elapsed: int, index: int) -> Tuple[int, int, bool]:
+    """
+    Advance the segment schedule to `elapsed` whole seconds into the workout.
+    Returns (segment index, ramp power at that time, whether the segment changed).
+    The index equals len(cum) once the workout is over (power is then 0).
+    """
+    changed = elapsed >= cum[index]
+    if changed:
+        index = int(np.searchsorted(cum, elapsed, side='right'))
+        if index >= len(cum):
+            return index, 0, True
+
+    # Linear ramp in integer arithmetic: (s*dur + (e-s)*t) // dur
+    start = int(starts[index])
+    end = int(ends[index])
+    dur = int(durs[index])
+    t = elapsed - int(cum[index]) + dur
+    return index, (start * dur + (end - start) * t) // dur, changed
+
+
 @dataclass
 class WorkoutSegment:
     """A segment of the workout."""
@@ -79,9 +167,13 @@ class WorkoutSegment:
         return int(power)
 
 
-@dataclass
+@dataclass(frozen=True)
 class WorkoutConfig:
-    """Configuration for a workout based on FTP."""
+    """Configuration for a workout based on FTP.
+
+    Immutable, so each derived power/HR value is computed once on first use;
+    set_ftp/set_hr_zones replace the whole config.
+    """
     ftp: int = 215
 
     # HR Zone 2 targets (configured by user)
@@ -89,41 +181,72 @@ class WorkoutConfig:
     hr_zone2_high: int = 143
 
     # Zone 2 is typically 56-75% of FTP, we'll use 65% as starting point for HR-targeted mode
-    @property
+    @cached_property
     def zone2_power(self) -> int:
         return int(self.ftp * 0.65)  # Starting power for HR-targeted mode
 
-    @property
+    @cached_property
     def zone2_low(self) -> int:
         return int(self.ftp * 0.50)  # Min power bound for HR targeting
 
-    @property
+    @cached_property
     def zone2_high(self) -> int:
         return int(self.ftp * 0.80)  # Max power bound for HR targeting
 
-    @property
+    @cached_property
     def warmup_start_power(self) -> int:
         return int(self.ftp * 0.40)
 
-    @property
+    @cached_property
     def cooldown_end_power(self) -> int:
         return int(self.ftp * 0.40)
 
-    @property
+    @cached_property
     def hr_target(self) -> int:
         """Target HR is middle of Zone 2."""
         return (self.hr_zone2_low + self.hr_zone2_high) // 2
 
+    @cached_property
+    def hr_adjust_thresholds(self) -> tuple:
+        """Sorted average-HR boundaries between the power adjustment buckets.
+
+        bisect_right on these gives the bucket index: below zone - 5, below
+        zone, below target - 3, near target, above target + 3, above zone,
+        above zone + 5. The upper bounds are bumped to the next float so that
+        "strictly above" matches bisect_right's "at or above".
+        """
+        low, high, target = self.hr_zone2_low, self.hr_zone2_high, self.hr_target
+        above = lambda x: math.nextafter(x, math.inf)
+        return (
+            low - 5,
+            low,
+            max(target - 3, low),
+            above(min(target + 3, high)),
+            above(high),
+            above(high + 5),
+        )
+
 
 class WorkoutManager:
     """Manages structured workouts with ERG mode control."""
 
     def __init__(self, ftp: int = 215, hr_zone2_low: int = 124, hr_zone2_high: int = 143):
         self.config = WorkoutConfig(ftp=ftp, hr_zone2_low=hr_zone2_low, hr_zone2_high=hr_zone2_high)
-        self.segments: List[WorkoutSegment] = []
+        # Segment schedule as parallel arrays (see _TEMPLATES)
+        self._names: Tuple[str, ...] = ()
+        self._template = np.zeros(0, dtype=_TEMPLATE_DTYPE)
+        self._phase_ids = np.zeros(0, dtype=np.int8)
+        self._starts = np.zeros(0, dtype=np.int32)
+        self._ends = np.zeros(0, dtype=np.int32)
+        self._durs = np.zeros(0, dtype=np.int32)
+        self._cum = np.zeros(0, dtype=np.int32)
+        self._total_duration = 0
+        self._summary_cache: Optional[dict] = None  # Cleared whenever the workout or config changes
         self.current_segment_index: int = -1
-        self.workout_start_time: Optional[float] = None
-        self.segment_start_time: Optional[float] = None
+        # Monotonic clock readings in ns; _now_ns is captured once per update()
+        self._workout_start_ns: Optional[int] = None
+        self._segment_start_ns: Optional[int] = None
+        self._now_ns = 0
 
         self.on_power_change: Optional[Callable[[int], None]] = None
         self.on_phase_change: Optional[Callable[[WorkoutPhase, str], None]] = None
@@ -136,171 +259,51 @@ class WorkoutManager:
         # HR-targeted power control for Zone 2
         self._hr_target_mode = False  # Only active for Zone 2 main phase
         self._current_adaptive_power = 0  # Current power in HR-target mode
-        self._last_hr_adjustment_time = 0.0
+        self._last_hr_adjustment_ns = 0
         self._hr_adjustment_interval = 30.0  # Adjust every 30 seconds
         self._power_step = 5  # Adjust by 5W at a time
-        self._hr_samples: List[int] = []  # Recent HR samples for averaging
+        # Power delta per hr_adjust_thresholds bucket (low HR -> more power)
+        step = self._power_step
+        self._hr_deltas = (2 * step, step, step, 0, -step, -step, -2 * step)
+        self._hr_samples: deque = deque(maxlen=30)  # Last ~30 seconds of HR for averaging
+        self._hr_sum = 0  # Running sum of _hr_samples
 
         # Build default workout: 5min warmup, 50min Z2, 5min cooldown
         self._build_workout("zone2")
 
     def _build_workout(self, workout_type: str):
-        """Build workout segments based on type."""
+        """Load the segment schedule for a workout type and scale it to FTP."""
         self._current_workout_type = workout_type
+        self._names, self._template = _TEMPLATES[workout_type]
+        self._durs = self._template['dur']
+        self._phase_ids = self._template['phase']
+        # Segment i ends at _cum[i] seconds into the workout
+        self._cum = np.cumsum(self._durs, dtype=np.int32)
+        self._total_duration = int(self._cum[-1])
+        self._scale_powers()
+
+    def _scale_powers(self):
+        """Recompute segment start/end watts from the template's FTP ratios."""
         ftp = self.config.ftp
+        self._starts = (self._template['sr'] * ftp).astype(np.int32)
+        self._ends = (self._template['er'] * ftp).astype(np.int32)
+        self._summary_cache = None
 
-        if workout_type == "zone2":
-            # Zone 2: 5min warmup, 50min steady Z2, 5min cooldown
-            self.segments = [
-                WorkoutSegment(
-                    name="Warmup",
-                    duration_seconds=5 * 60,
-                    target_power_start=self.config.warmup_start_power,
-                    target_power_end=self.config.zone2_power,
-                    phase=WorkoutPhase.WARMUP
-                ),
-                WorkoutSegment(
-                    name="Zone 2",
-                    duration_seconds=50 * 60,
-                    target_power_start=self.config.zone2_power,
-                    target_power_end=self.config.zone2_power,
-                    phase=WorkoutPhase.MAIN
-                ),
-                WorkoutSegment(
-                    name="Cooldown",
-                    duration_seconds=5 * 60,
-                    target_power_start=self.config.zone2_power,
-                    target_power_end=self.config.cooldown_end_power,
-                    phase=WorkoutPhase.COOLDOWN
-                ),
-            ]
-
-        elif workout_type == "vo2max":
-            # VO2max: 5min warmup, 5x(3min @ 120% + 3min recovery), 5min cooldown
-            vo2_power = int(ftp * 1.20)
-            recovery_power = int(ftp * 0.50)
-
-            self.segments = [
-                WorkoutSegment(
-                    name="Warmup",
-                    duration_seconds=5 * 60,
-                    target_power_start=self.config.warmup_start_power,
-                    target_power_end=int(ftp * 0.65),
-                    phase=WorkoutPhase.WARMUP
-                ),
-            ]
-
-            # 5 intervals
-            for i in range(5):
-                self.segments.append(WorkoutSegment(
-                    name=f"Interval {i+1}",
-                    duration_seconds=3 * 60,
-                    target_power_start=vo2_power,
-                    target_power_end=vo2_power,
-                    phase=WorkoutPhase.INTERVAL
-                ))
-                if i < 4:  # No recovery after last interval
-                    self.segments.append(WorkoutSegment(
-                        name=f"Recovery {i+1}",
-                        duration_seconds=3 * 60,
-                        target_power_start=recovery_power,
-                        target_power_end=recovery_power,
-                        phase=WorkoutPhase.RECOVERY
-                    ))
-
-            self.segments.append(WorkoutSegment(
-                name="Cooldown",
-                duration_seconds=5 * 60,
-                target_power_start=recovery_power,
-                target_power_end=self.config.cooldown_end_power,
-                phase=WorkoutPhase.COOLDOWN
-            ))
-
-        elif workout_type == "sweet_spot":
-            # Sweet Spot: 5min warmup, 2x(20min @ 90% FTP + 5min recovery), 5min cooldown
-            ss_power = int(ftp * 0.90)
-            recovery_power = int(ftp * 0.55)
-
-            self.segments = [
-                WorkoutSegment(
-                    name="Warmup",
-                    duration_seconds=5 * 60,
-                    target_power_start=self.config.warmup_start_power,
-                    target_power_end=int(ftp * 0.65),
-                    phase=WorkoutPhase.WARMUP
-                ),
-                WorkoutSegment(
-                    name="Sweet Spot 1",
-                    duration_seconds=20 * 60,
-                    target_power_start=ss_power,
-                    target_power_end=ss_power,
-                    phase=WorkoutPhase.MAIN
-                ),
-                WorkoutSegment(
-                    name="Recovery",
-                    duration_seconds=5 * 60,
-                    target_power_start=recovery_power,
-                    target_power_end=recovery_power,
-                    phase=WorkoutPhase.RECOVERY
-                ),
-                WorkoutSegment(
-                    name="Sweet Spot 2",
-                    duration_seconds=20 * 60,
-                    target_power_start=ss_power,
-                    target_power_end=ss_power,
-                    phase=WorkoutPhase.MAIN
-                ),
-                WorkoutSegment(
-                    name="Cooldown",
-                    duration_seconds=5 * 60,
-                    target_power_start=recovery_power,
-                    target_power_end=self.config.cooldown_end_power,
-                    phase=WorkoutPhase.COOLDOWN
-                ),
-            ]
-
-        elif workout_type == "tempo":
-            # Tempo: 5min warmup, 2x(15min @ 97% FTP + 5min recovery), 5min cooldown
-            tempo_power = int(ftp * 0.97)
-            recovery_power = int(ftp * 0.55)
-
-            self.segments = [
-                WorkoutSegment(
-                    name="Warmup",
-                    duration_seconds=5 * 60,
-                    target_power_start=self.config.warmup_start_power,
-                    target_power_end=int(ftp * 0.65),
-                    phase=WorkoutPhase.WARMUP
-                ),
-                WorkoutSegment(
-                    name="Tempo 1",
-                    duration_seconds=15 * 60,
-                    target_power_start=tempo_power,
-                    target_power_end=tempo_power,
-                    phase=WorkoutPhase.MAIN
-                ),
-                WorkoutSegment(
-                    name="Recovery",
-                    duration_seconds=5 * 60,
-                    target_power_start=recovery_power,
-                    target_power_end=recovery_power,
-                    phase=WorkoutPhase.RECOVERY
-                ),
-                WorkoutSegment(
-                    name="Tempo 2",
-                    duration_seconds=15 * 60,
-                    target_power_start=tempo_power,
-                    target_power_end=tempo_power,
-                    phase=WorkoutPhase.MAIN
-                ),
-                WorkoutSegment(
-                    name="Cooldown",
-                    duration_seconds=5 * 60,
-                    target_power_start=recovery_power,
-                    target_power_end=self.config.cooldown_end_power,
-                    phase=WorkoutPhase.COOLDOWN
-                ),
-            ]
+    @property
+    def segments(self) -> List[WorkoutSegment]:
+        """The current workout as WorkoutSegment objects (built on each access)."""
+        return [
+            WorkoutSegment(
+                name=name,
+                duration_seconds=int(dur),
+                target_power_start=int(start),
+                target_power_end=int(end),
+                phase=_PHASE_BY_ID[phase_id]
+            )
+            for name, dur, start, end, phase_id in zip(
+                self._names, self._durs, self._starts, self._ends, self._phase_ids
+            )
+        ]
 
     def set_workout_type(self, workout_type: str):
         """Change the workout type."""
@@ -310,7 +313,8 @@ class WorkoutManager:
     def get_workout_types(self) -> List[dict]:
         """Get list of available workout types with metadata."""
         return [
-            {"id": k, **v} for k, v in WORKOUT_LIBRARY.items()
+            {"id": k, **{key: value for key, value in v.items() if key != "structure"}}
+            for k, v in WORKOUT_LIBRARY.items()
         ]
 
     @property
@@ -324,7 +328,7 @@ class WorkoutManager:
             hr_zone2_low=self.config.hr_zone2_low,
             hr_zone2_high=self.config.hr_zone2_high
         )
-        self._build_workout(self._current_workout_type)
+        self._scale_powers()
 
     def set_hr_zones(self, hr_low: int, hr_high: int):
         """Update HR Zone 2 boundaries."""
@@ -333,26 +337,29 @@ class WorkoutManager:
             hr_zone2_low=hr_low,
             hr_zone2_high=hr_high
         )
+        self._summary_cache = None
 
     def start(self):
         """Start the workout."""
-        self.workout_start_time = time.time()
-        self.segment_start_time = time.time()
+        now = time.monotonic_ns()
+        self._workout_start_ns = now
+        self._segment_start_ns = now
+        self._now_ns = now
         self.current_segment_index = 0
         self._is_running = True
 
         # Reset HR-targeting state
         self._hr_target_mode = False
         self._current_adaptive_power = self.config.zone2_power
-        self._last_hr_adjustment_time = time.time()
+        self._last_hr_adjustment_ns = now
         self._hr_samples.clear()
+        self._hr_sum = 0
 
-        segment = self.segments[0]
         if self.on_phase_change:
-            self.on_phase_change(segment.phase, segment.name)
+            self.on_phase_change(_PHASE_BY_ID[self._phase_ids[0]], self._names[0])
 
         # Set initial power
-        initial_power = segment.get_power_at_time(0)
+        initial_power = int(self._starts[0])
         self._last_target_power = initial_power
         if self.on_power_change:
             self.on_power_change(initial_power)
@@ -363,14 +370,17 @@ class WorkoutManager:
         self.current_segment_index = -1
         self._hr_target_mode = False
         self._hr_samples.clear()
+        self._hr_sum = 0
 
     def add_hr_sample(self, hr: int):
         """Add an HR sample for averaging (call this from HR data callback)."""
         if self._hr_target_mode:
-            self._hr_samples.append(hr)
-            # Keep last 30 samples (~30 seconds of data)
-            if len(self._hr_samples) > 30:
-                self._hr_samples.pop(0)
+            samples = self._hr_samples
+            # The deque keeps the last 30 samples; drop the evicted one from the sum
+            if len(samples) == samples.maxlen:
+                self._hr_sum -= samples[0]
+            samples.append(hr)
+            self._hr_sum += hr
 
     def get_hr_adjusted_power(self) -> Optional[int]:
         """
@@ -381,40 +391,19 @@ class WorkoutManager:
         if not self._hr_target_mode or len(self._hr_samples) < 10:
             return None
 
-        now = time.time()
-        if now - self._last_hr_adjustment_time < self._hr_adjustment_interval:
+        now = time.monotonic_ns()
+        if now - self._last_hr_adjustment_ns < self._hr_adjustment_interval * 1_000_000_000:
             return None
 
-        self._last_hr_adjustment_time = now
+        self._last_hr_adjustment_ns = now
 
         # Calculate average HR from recent samples
-        avg_hr = sum(self._hr_samples) / len(self._hr_samples)
-        target_hr = self.config.hr_target
-        hr_low = self.config.hr_zone2_low
-        hr_high = self.config.hr_zone2_high
+        avg_hr = self._hr_sum / len(self._hr_samples)
 
         old_power = self._current_adaptive_power
-        new_power = old_power
-
-        # Adjust power based on HR deviation
-        if avg_hr > hr_high + 5:
-            # HR way too high - bigger reduction
-            new_power = old_power - (self._power_step * 2)
-        elif avg_hr > hr_high:
-            # HR above zone - reduce power
-            new_power = old_power - self._power_step
-        elif avg_hr < hr_low - 5:
-            # HR way too low - bigger increase
-            new_power = old_power + (self._power_step * 2)
-        elif avg_hr < hr_low:
-            # HR below zone - increase power
-            new_power = old_power + self._power_step
-        elif avg_hr > target_hr + 3:
-            # HR above target (but in zone) - slight reduction
-            new_power = old_power - self._power_step
-        elif avg_hr < target_hr - 3:
-            # HR below target (but in zone) - slight increase
-            new_power = old_power + self._power_step
+        # Bucket the average HR against the zone/target thresholds
+        delta = self._hr_deltas[bisect.bisect_right(self.config.hr_adjust_thresholds, avg_hr)]
+        new_power = old_power + delta
 
         # Clamp to bounds
         new_power = max(self.config.zone2_low, min(self.config.zone2_high, new_power))
@@ -440,11 +429,12 @@ class WorkoutManager:
         """
         Update workout state. Call this regularly (e.g., every second).
         Returns target power if it changed, None otherwise.
+        The elapsed/remaining properties report the clock reading taken here.
         """
         if not self._is_running or self.current_segment_index < 0:
             return None
 
-        if self.current_segment_index >= len(self.segments):
+        if self.current_segment_index >= len(self._names):
             # Workout complete
             self._is_running = False
             if self.on_workout_complete:
@@ -453,16 +443,19 @@ class WorkoutManager:
                 self.on_phase_change(WorkoutPhase.COMPLETED, "Complete")
             return None
 
-        now = time.time()
-        segment = self.segments[self.current_segment_index]
-        segment_elapsed = now - self.segment_start_time
+        now = self._now_ns = time.monotonic_ns()
+        # Segment boundaries are fixed offsets from the workout start, so late
+        # ticks never push the schedule back
+        index, ramp_power, changed = _workout_tick(
+            self._starts, self._ends, self._durs, self._cum,
+            (now - self._workout_start_ns) // 1_000_000_000, self.current_segment_index
+        )
 
         # Check if segment is complete
-        if segment_elapsed >= segment.duration_seconds:
-            self.current_segment_index += 1
-            self.segment_start_time = now
+        if changed:
+            self.current_segment_index = index
 
-            if self.current_segment_index >= len(self.segments):
+            if index >= len(self._names):
                 # Workout complete
                 self._is_running = False
                 self._hr_target_mode = False
@@ -473,27 +466,28 @@ class WorkoutManager:
                 return None
 
             # Move to next segment
-            segment = self.segments[self.current_segment_index]
-            segment_elapsed = 0
+            self._segment_start_ns = self._workout_start_ns + int(self._cum[index - 1]) * 1_000_000_000
+            phase_id = int(self._phase_ids[index])
 
             # Enable/disable HR-target mode based on phase and workout type
-            if self._current_workout_type == "zone2" and segment.phase == WorkoutPhase.MAIN:
+            if phase_id == _MAIN_PHASE_ID and self._current_workout_type == "zone2":
                 self._hr_target_mode = True
                 self._current_adaptive_power = self.config.zone2_power
                 self._hr_samples.clear()
-                self._last_hr_adjustment_time = now
+                self._hr_sum = 0
+                self._last_hr_adjustment_ns = now
             else:
                 self._hr_target_mode = False
 
             if self.on_phase_change:
-                self.on_phase_change(segment.phase, segment.name)
+                self.on_phase_change(_PHASE_BY_ID[phase_id], self._names[index])
 
         # For Zone 2 main phase, use HR-targeted power (handled separately via get_hr_adjusted_power)
         # For other phases/workouts, use segment-defined power
         if self._hr_target_mode:
             target_power = self._current_adaptive_power
         else:
-            target_power = segment.get_power_at_time(int(segment_elapsed))
+            target_power = ramp_power
 
         # Only notify if power changed
         if target_power != self._last_target_power:
@@ -512,15 +506,15 @@ class WorkoutManager:
     def current_phase(self) -> WorkoutPhase:
         if self.current_segment_index < 0:
             return WorkoutPhase.NOT_STARTED
-        if self.current_segment_index >= len(self.segments):
+        if self.current_segment_index >= len(self._names):
             return WorkoutPhase.COMPLETED
-        return self.segments[self.current_segment_index].phase
+        return _PHASE_BY_ID[self._phase_ids[self.current_segment_index]]
 
     @property
     def current_segment_name(self) -> str:
-        if self.current_segment_index < 0 or self.current_segment_index >= len(self.segments):
+        if self.current_segment_index < 0 or self.current_segment_index >= len(self._names):
             return ""
-        return self.segments[self.current_segment_index].name
+        return self._names[self.current_segment_index]
 
     @property
     def target_power(self) -> int:
@@ -528,13 +522,13 @@ class WorkoutManager:
 
     @property
     def total_duration_seconds(self) -> int:
-        return sum(s.duration_seconds for s in self.segments)
+        return self._total_duration
 
     @property
     def elapsed_seconds(self) -> float:
-        if self.workout_start_time is None:
+        if self._workout_start_ns is None:
             return 0.0
-        return time.time() - self.workout_start_time
+        return (self._now_ns - self._workout_start_ns) * 1e-9
 
     @property
     def remaining_seconds(self) -> float:
@@ -542,20 +536,40 @@ class WorkoutManager:
 
     @property
     def segment_elapsed_seconds(self) -> float:
-        if self.segment_start_time is None:
+        if self._segment_start_ns is None:
             return 0.0
-        return time.time() - self.segment_start_time
+        return (self._now_ns - self._segment_start_ns) * 1e-9
 
     @property
     def segment_remaining_seconds(self) -> float:
-        if self.current_segment_index < 0 or self.current_segment_index >= len(self.segments):
+        if self.current_segment_index < 0 or self.current_segment_index >= len(self._names):
             return 0.0
-        segment = self.segments[self.current_segment_index]
-        return max(0, segment.duration_seconds - self.segment_elapsed_seconds)
+        return max(0, int(self._durs[self.current_segment_index]) - self.segment_elapsed_seconds)
+
+    def seconds_until_next_change(self) -> float:
+        """Seconds until the current segment ends or its ramp power next steps."""
+        index = self.current_segment_index
+        if not self._is_running or index < 0 or index >= len(self._names):
+            return 0.0
+
+        duration = int(self._durs[index])
+        elapsed = self.segment_elapsed_seconds
+        remaining = duration - elapsed
+
+        # Ramps change power by 1W every duration/|delta| seconds
+        delta = abs(int(self._ends[index]) - int(self._starts[index]))
+        if delta and not self._hr_target_mode:
+            step = duration / delta
+            remaining = min(remaining, (int(elapsed / step) + 1) * step - elapsed)
+
+        return max(0.0, remaining)
 
     def get_workout_summary(self) -> dict:
-        """Get a summary of the workout structure."""
-        return {
+        """Get a summary of the workout structure (cached; do not modify the result)."""
+        if self._summary_cache is not None:
+            return self._summary_cache
+
+        self._summary_cache = {
             "ftp": self.config.ftp,
             "zone2_power": self.config.zone2_power,
             "zone2_range": f"{self.config.zone2_low}-{self.config.zone2_high}W",
@@ -575,3 +589,4 @@ class WorkoutManager:
                 for s in self.segments
             ]
         }
+        return self._summary_cache
@@ -7,22 +7,27 @@ Monitors workout data and detects issues like:
 """
 
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import List, Optional, Tuple
-from collections import deque
-import numpy as np
+from array import array
 
+# Alert severity indexed by "is critical"
+_SEVERITY = ('warning', 'critical')
 
-@dataclass
+# (status, color) indexed by zone bucket: 0 in zone, 1 above, 2 below
+_ZONE_STATUS = (("IN ZONE 2", "green"), ("ABOVE ZONE 2", "red"), ("BELOW ZONE 2", "blue"))
+
+
+@dataclass(slots=True)
 class Alert:
     """Represents an alert to show the user."""
     type: str  # 'hr_high', 'hr_low', 'cardiac_drift', 'decoupling'
     message: str
     severity: str  # 'warning', 'critical'
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float  # time.time() of the update() that raised it
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkoutStats:
     """Rolling statistics for the workout."""
     avg_hr: float = 0.0
@@ -35,6 +40,37 @@ class WorkoutStats:
     cardiac_drift_percent: float = 0.0
 
 
+def _cardiac_drift(avg_hr_1: float, avg_power_1: float,
+                   avg_hr_2: float, avg_power_2: float) -> Optional[float]:
+    """
+    Drop in efficiency factor (power/HR) from the first half to the second, in
+    percent. Returns None when the first half has no HR or power to compare.
+    """
+    if avg_hr_1 <= 0 or avg_power_1 <= 0:
+        return None
+
+    # Calculate efficiency factor for each half (power/hr)
+    ef_1 = avg_power_1 / avg_hr_1
+    ef_2 = avg_power_2 / avg_hr_2 if avg_hr_2 > 0 else 0
+
+    # Cardiac drift = decrease in efficiency
+    return ((ef_1 - ef_2) / ef_1) * 100
+
+
+def _power_hr_change(avg_hr_recent: float, avg_power_recent: float,
+                     avg_hr_older: float, avg_power_older: float) -> Optional[Tuple[float, float]]:
+    """
+    Percent change of (power, HR) from the older window to the recent one.
+    Returns None when the older window has no HR or power to compare.
+    """
+    if avg_hr_older == 0 or avg_power_older == 0:
+        return None
+
+    power_change = ((avg_power_recent - avg_power_older) / avg_power_older) * 100
+    hr_change = ((avg_hr_recent - avg_hr_older) / avg_hr_older) * 100
+    return power_change, hr_change
+
+
 class ZoneAnalyzer:
     """Analyzes workout data for Zone 2 training quality."""
 
@@ -53,26 +89,37 @@ class ZoneAnalyzer:
         self.hr_alert_delay = hr_alert_delay
 
         # Data storage for analysis
-        self._hr_history: deque = deque(maxlen=3600)  # 1 hour at 1Hz
-        self._power_history: deque = deque(maxlen=3600)
-        self._cadence_history: deque = deque(maxlen=3600)
-        self._timestamps: deque = deque(maxlen=3600)
-
-        # For cardiac drift calculation (first half vs second half)
-        self._first_half_hr: List[int] = []
-        self._first_half_power: List[int] = []
-        self._second_half_hr: List[int] = []
-        self._second_half_power: List[int] = []
+        # Ring buffers of packed int16 samples, 1 hour at 1Hz; _head is the
+        # next slot to write and _filled the number of valid samples
+        self._history_size = 3600
+        self._hr_buf = array('h', bytes(2 * self._history_size))
+        self._power_buf = array('h', bytes(2 * self._history_size))
+        self._cadence_buf = array('h', bytes(2 * self._history_size))
+        self._head = 0
+        self._filled = 0
+
+        # Running sums over the histories, so averages need no rescan
+        self._hr_sum = 0
+        self._power_sum = 0
+        self._cadence_sum = 0
+
+        # For cardiac drift calculation (first half vs second half, split at len // 2)
+        self._first_half_hr_sum = 0
+        self._first_half_power_sum = 0
+
+        # For decoupling (last 5 minutes vs the 5 minutes before)
+        self._recent_hr_sum = 0
+        self._recent_power_sum = 0
+        self._older_hr_sum = 0
+        self._older_power_sum = 0
 
         # Alert state tracking
         self._hr_out_of_zone_start: Optional[float] = None
         self._last_alert_time: dict = {}
         self._alert_cooldown = 30.0  # seconds between repeat alerts
 
-        # Zone time tracking
-        self._time_in_zone = 0.0
-        self._time_above = 0.0
-        self._time_below = 0.0
+        # Zone time tracking, seconds [in zone, above, below]
+        self._zone_times = [0.0, 0.0, 0.0]
         self._last_update_time: Optional[float] = None
 
         # Workout start time
@@ -96,48 +143,116 @@ class ZoneAnalyzer:
             self._workout_start = now
 
         # Store data
-        self._hr_history.append(hr)
-        self._power_history.append(power)
-        self._cadence_history.append(cadence)
-        self._timestamps.append(now)
-
-        # Update zone time tracking (only during main phase)
-        if self._last_update_time is not None:
-            dt = now - self._last_update_time
-            if phase == 'main':
-                if self.zone2_low <= hr <= self.zone2_high:
-                    self._time_in_zone += dt
-                elif hr > self.zone2_high:
-                    self._time_above += dt
-                else:
-                    self._time_below += dt
+        self._append_sample(hr, power, cadence)
+
+        last_update = self._last_update_time
         self._last_update_time = now
 
-        # Only check HR zone alerts during main phase (not warmup/cooldown)
-        if phase == 'main':
-            hr_alert = self._check_hr_zone(hr, now)
-            if hr_alert:
-                alerts.append(hr_alert)
+        # Zone time and HR zone alerts are only tracked during main phase
+        # (not warmup/cooldown)
+        if phase != 'main':
+            return alerts
+
+        # Zone bucket, shared by zone time and HR alerts: 1 above zone, 2 below zone, 0 in zone
+        zone = (hr > self.zone2_high) or 2 * (hr < self.zone2_low)
+
+        # Update zone time tracking
+        if last_update is not None:
+            self._zone_times[zone] += now - last_update
 
-            # Check for cardiac drift (need sufficient data)
-            if len(self._hr_history) > 300:  # At least 5 minutes
-                drift_alert = self._check_cardiac_drift(now)
-                if drift_alert:
-                    alerts.append(drift_alert)
+        hr_alert = self._check_hr_zone(hr, zone, now)
+        if hr_alert:
+            alerts.append(hr_alert)
 
-            # Check for power/HR decoupling
-            if len(self._hr_history) > 300:
-                decoupling_alert = self._check_decoupling(now)
-                if decoupling_alert:
-                    alerts.append(decoupling_alert)
+        n = self._filled
+
+        # Check for cardiac drift (need sufficient data); skip the
+        # analysis entirely while the alert is cooling down
+        if n > 300 and self._can_alert('cardiac_drift', now):  # At least 5 minutes
+            drift_alert = self._check_cardiac_drift(now)
+            if drift_alert:
+                alerts.append(drift_alert)
+
+        # Check for power/HR decoupling (needs two 5 minute windows)
+        if n > 600 and self._can_alert('decoupling', now):
+            decoupling_alert = self._check_decoupling(now)
+            if decoupling_alert:
+                alerts.append(decoupling_alert)
 
         return alerts
 
-    def _check_hr_zone(self, hr: int, now: float) -> Optional[Alert]:
-        """Check if HR is out of Zone 2."""
-        in_zone = self.zone2_low <= hr <= self.zone2_high
+    def _slot(self, i: int) -> int:
+        """Return the ring buffer slot of the i-th oldest sample in the history."""
+        return (self._head - self._filled + i) % self._history_size
+
+    def _append_sample(self, hr: int, power: int, cadence: int):
+        """Append one sample to the history and update the running sums."""
+        hr_buf = self._hr_buf
+        power_buf = self._power_buf
+        head = self._head
+        prev = self._filled
+        full = prev == self._history_size
+
+        if full:
+            # The slot being overwritten holds the oldest sample; it leaves the
+            # totals and the first half
+            old_hr = hr_buf[head]
+            old_power = power_buf[head]
+            self._hr_sum -= old_hr
+            self._power_sum -= old_power
+            self._cadence_sum -= self._cadence_buf[head]
+            self._first_half_hr_sum -= old_hr
+            self._first_half_power_sum -= old_power
+
+        hr_buf[head] = hr
+        power_buf[head] = power
+        self._cadence_buf[head] = cadence
+        self._head = (head + 1) % self._history_size
+        n = prev if full else prev + 1
+        self._filled = n
+        self._hr_sum += hr
+        self._power_sum += power
+        self._cadence_sum += cadence
+
+        # The sample just before the new midpoint joins the first half when the
+        # midpoint advances (growing) or the window slides (full)
+        half = n // 2
+        if full or half > prev // 2:
+            slot = self._slot(half - 1)
+            self._first_half_hr_sum += hr_buf[slot]
+            self._first_half_power_sum += power_buf[slot]
+
+        # Slide the last-300 / previous-300 windows
+        self._recent_hr_sum += hr
+        self._recent_power_sum += power
+        if n > 300:
+            slot = self._slot(n - 301)
+            moved_hr = hr_buf[slot]
+            moved_power = power_buf[slot]
+            self._recent_hr_sum -= moved_hr
+            self._recent_power_sum -= moved_power
+            self._older_hr_sum += moved_hr
+            self._older_power_sum += moved_power
+            if n > 600:
+                slot = self._slot(n - 601)
+                self._older_hr_sum -= hr_buf[slot]
+                self._older_power_sum -= power_buf[slot]
+
+    def _half_means(self) -> Tuple[float, float, float, float]:
+        """Average (hr, power) over the first and second half of the history."""
+        n = self._filled
+        half = n // 2
+        second = n - half
+        return (
+            self._first_half_hr_sum / half if half else 0,
+            self._first_half_power_sum / half if half else 0,
+            (self._hr_sum - self._first_half_hr_sum) / second if second else 0,
+            (self._power_sum - self._first_half_power_sum) / second if second else 0,
+        )
 
-        if in_zone:
+    def _check_hr_zone(self, hr: int, zone: int, now: float) -> Optional[Alert]:
+        """Check if HR is out of Zone 2 (zone is the bucket computed in update())."""
+        if not zone:
             self._hr_out_of_zone_start = None
             return None
 
@@ -151,95 +266,66 @@ class ZoneAnalyzer:
             return None
 
         # Check cooldown
-        alert_type = 'hr_high' if hr > self.zone2_high else 'hr_low'
+        above = zone == 1
+        alert_type = 'hr_high' if above else 'hr_low'
         if not self._can_alert(alert_type, now):
             return None
 
         self._last_alert_time[alert_type] = now
 
-        if hr > self.zone2_high:
+        if above:
             return Alert(
                 type='hr_high',
                 message=f"Heart rate too HIGH: {hr} bpm (Zone 2 max: {self.zone2_high}). Ease up!",
-                severity='warning' if hr < self.zone2_high + 10 else 'critical'
+                severity=_SEVERITY[hr >= self.zone2_high + 10],
+                timestamp=now
             )
         else:
             return Alert(
                 type='hr_low',
                 message=f"Heart rate too LOW: {hr} bpm (Zone 2 min: {self.zone2_low}). Push a bit harder!",
-                severity='warning'
+                severity='warning',
+                timestamp=now
             )
 
     def _check_cardiac_drift(self, now: float) -> Optional[Alert]:
         """
         Check for cardiac drift - HR increasing at same power output.
         Compares first half of workout to second half.
+        The caller checks the alert cooldown first.
         """
-        if not self._can_alert('cardiac_drift', now):
-            return None
-
-        n = len(self._hr_history)
-        half = n // 2
-
-        first_half_hr = list(self._hr_history)[:half]
-        first_half_power = list(self._power_history)[:half]
-        second_half_hr = list(self._hr_history)[half:]
-        second_half_power = list(self._power_history)[half:]
-
-        # Calculate average HR and power for each half
-        avg_hr_1 = np.mean(first_half_hr) if first_half_hr else 0
-        avg_hr_2 = np.mean(second_half_hr) if second_half_hr else 0
-        avg_power_1 = np.mean(first_half_power) if first_half_power else 0
-        avg_power_2 = np.mean(second_half_power) if second_half_power else 0
-
-        if avg_hr_1 == 0 or avg_power_1 == 0:
-            return None
-
-        # Calculate efficiency factor for each half (power/hr)
-        ef_1 = avg_power_1 / avg_hr_1
-        ef_2 = avg_power_2 / avg_hr_2 if avg_hr_2 > 0 else 0
-
-        # Cardiac drift = decrease in efficiency
-        if ef_1 > 0:
-            drift_percent = ((ef_1 - ef_2) / ef_1) * 100
+        # Compare average HR and power of each half
+        drift_percent = _cardiac_drift(*self._half_means())
 
-            if drift_percent > self.drift_threshold:
-                self._last_alert_time['cardiac_drift'] = now
-                return Alert(
-                    type='cardiac_drift',
-                    message=f"Cardiac drift detected: {drift_percent:.1f}%. Your HR is creeping up - sign of fatigue.",
-                    severity='warning' if drift_percent < 10 else 'critical'
-                )
+        if drift_percent is not None and drift_percent > self.drift_threshold:
+            self._last_alert_time['cardiac_drift'] = now
+            return Alert(
+                type='cardiac_drift',
+                message=f"Cardiac drift detected: {drift_percent:.1f}%. Your HR is creeping up - sign of fatigue.",
+                severity=_SEVERITY[drift_percent >= 10],
+                timestamp=now
+            )
 
         return None
 
     def _check_decoupling(self, now: float) -> Optional[Alert]:
         """
         Check for power/HR decoupling - efficiency dropping significantly.
+        The caller checks the alert cooldown first.
         """
-        if not self._can_alert('decoupling', now):
-            return None
-
         # Look at last 5 minutes vs previous 5 minutes
-        recent_hr = list(self._hr_history)[-300:]
-        recent_power = list(self._power_history)[-300:]
-        older_hr = list(self._hr_history)[-600:-300] if len(self._hr_history) > 600 else []
-        older_power = list(self._power_history)[-600:-300] if len(self._power_history) > 600 else []
-
-        if not older_hr or not older_power:
+        if self._filled <= 600:
             return None
 
-        avg_hr_recent = np.mean(recent_hr)
-        avg_power_recent = np.mean(recent_power)
-        avg_hr_older = np.mean(older_hr)
-        avg_power_older = np.mean(older_power)
-
-        if avg_hr_older == 0 or avg_power_older == 0:
+        changes = _power_hr_change(
+            self._recent_hr_sum / 300, self._recent_power_sum / 300,
+            self._older_hr_sum / 300, self._older_power_sum / 300
+        )
+        if changes is None:
             return None
 
         # Check if power dropped but HR stayed same/increased
-        power_change = ((avg_power_recent - avg_power_older) / avg_power_older) * 100
-        hr_change = ((avg_hr_recent - avg_hr_older) / avg_hr_older) * 100
+        power_change, hr_change = changes
 
         # Decoupling: power down, HR up or stable
         if power_change < -5 and hr_change > -2:
@@ -249,7 +335,8 @@ class ZoneAnalyzer:
                 return Alert(
                     type='decoupling',
                     message=f"Power/HR decoupling: Power down {abs(power_change):.1f}% but HR unchanged. Consider ending soon.",
-                    severity='warning'
+                    severity='warning',
+                    timestamp=now
                 )
 
         return None
@@ -261,34 +348,29 @@ class ZoneAnalyzer:
 
     def get_stats(self) -> WorkoutStats:
         """Get current workout statistics."""
-        hr_list = list(self._hr_history)
-        power_list = list(self._power_history)
-        cadence_list = list(self._cadence_history)
+        n = self._filled
 
-        avg_hr = np.mean(hr_list) if hr_list else 0
-        avg_power = np.mean(power_list) if power_list else 0
-        avg_cadence = np.mean(cadence_list) if cadence_list else 0
+        avg_hr = self._hr_sum / n if n else 0
+        avg_power = self._power_sum / n if n else 0
+        avg_cadence = self._cadence_sum / n if n else 0
 
         # Calculate efficiency factor
         ef = avg_power / avg_hr if avg_hr > 0 else 0
 
         # Calculate cardiac drift
-        n = len(hr_list)
         drift = 0.0
         if n > 300:
-            half = n // 2
-            ef_1 = np.mean(power_list[:half]) / np.mean(hr_list[:half]) if np.mean(hr_list[:half]) > 0 else 0
-            ef_2 = np.mean(power_list[half:]) / np.mean(hr_list[half:]) if np.mean(hr_list[half:]) > 0 else 0
-            if ef_1 > 0:
-                drift = ((ef_1 - ef_2) / ef_1) * 100
+            drift = _cardiac_drift(*self._half_means())
+            if drift is None:
+                drift = 0.0
 
         return WorkoutStats(
             avg_hr=avg_hr,
             avg_power=avg_power,
             avg_cadence=avg_cadence,
-            time_in_zone=self._time_in_zone,
-            time_above_zone=self._time_above,
-            time_below_zone=self._time_below,
+            time_in_zone=self._zone_times[0],
+            time_above_zone=self._zone_times[1],
+            time_below_zone=self._zone_times[2],
             efficiency_factor=ef,
             cardiac_drift_percent=drift
         )
@@ -298,24 +380,25 @@ class ZoneAnalyzer:
         Get current zone status.
         Returns (status, color) tuple.
         """
-        if hr < self.zone2_low:
-            return ("BELOW ZONE 2", "blue")
-        elif hr > self.zone2_high:
-            return ("ABOVE ZONE 2", "red")
-        else:
-            return ("IN ZONE 2", "green")
+        # Below is tested first so misordered bounds report as before
+        return _ZONE_STATUS[2 * (hr < self.zone2_low) or (hr > self.zone2_high)]
 
     def reset(self):
         """Reset analyzer for a new workout."""
-        self._hr_history.clear()
-        self._power_history.clear()
-        self._cadence_history.clear()
-        self._timestamps.clear()
+        self._head = 0
+        self._filled = 0
+        self._hr_sum = 0
+        self._power_sum = 0
+        self._cadence_sum = 0
+        self._first_half_hr_sum = 0
+        self._first_half_power_sum = 0
+        self._recent_hr_sum = 0
+        self._recent_power_sum = 0
+        self._older_hr_sum = 0
+        self._older_power_sum = 0
         self._hr_out_of_zone_start = None
         self._last_alert_time.clear()
-        self._time_in_zone = 0.0
-        self._time_above = 0.0
-        self._time_below = 0.0
+        self._zone_times = [0.0, 0.0, 0.0]
         self._last_update_time = None
         self._workout_start = None
 